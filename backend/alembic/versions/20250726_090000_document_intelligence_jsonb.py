@@ -0,0 +1,49 @@
+"""Store document intelligence as native JSON
+
+Revision ID: doc_intelligence_jsonb
+Revises: doc_intelligence_universal
+Create Date: 2025-07-26 09:00:00
+
+"""
+from alembic import op
+
+# revision identifiers
+revision = 'doc_intelligence_jsonb'
+down_revision = 'doc_intelligence_universal'
+branch_labels = None
+depends_on = None
+
+JSON_COLUMNS = ('extracted_concepts', 'extracted_examples', 'socratic_questions')
+
+def upgrade():
+    """Convert the JSON text columns to JSONB and index concepts"""
+    if op.get_bind().dialect.name != 'postgresql':
+        # SQLite's JSON type is TEXT underneath - existing rows already match
+        print("ℹ️ Not on Postgres - document intelligence columns left as JSON text")
+        return
+    
+    print("🔄 Converting document intelligence fields to JSONB...")
+    
+    for column in JSON_COLUMNS:
+        op.execute(
+            f"ALTER TABLE modules ALTER COLUMN {column} TYPE JSONB USING {column}::jsonb"
+        )
+    op.create_index('ix_modules_concepts_gin', 'modules', ['extracted_concepts'],
+                    postgresql_using='gin')
+    
+    print("✅ Document intelligence fields are now JSONB")
+
+def downgrade():
+    """Convert the JSONB columns back to text"""
+    if op.get_bind().dialect.name != 'postgresql':
+        return
+    
+    print("🔄 Converting document intelligence fields back to TEXT...")
+    
+    op.drop_index('ix_modules_concepts_gin', table_name='modules')
+    for column in JSON_COLUMNS:
+        op.execute(
+            f"ALTER TABLE modules ALTER COLUMN {column} TYPE TEXT USING {column}::text"
+        )
+    
+    print("✅ Document intelligence fields restored to TEXT")
@@ -12,6 +12,7 @@ class Settings(BaseSettings):
     app_name: str = "Harv v2.0 - Intelligent Tutoring System"
     version: str = "2.0.0"
     debug: bool = False
+    environment: str = "development"  # "production" blocks the demo seeding scripts
 
     # Database
     database_url: str = "sqlite:///./harv_v2.db"
@@ -3,18 +3,27 @@ Database configuration and session management
 Clean SQLAlchemy setup with proper connection handling
 """
 
-from sqlalchemy import create_engine
+from sqlalchemy import create_engine, inspect
 from sqlalchemy.ext.declarative import declarative_base
 from sqlalchemy.orm import sessionmaker, Session
-from typing import Generator
+from typing import Any, Dict, Generator, List
+import orjson
+import os
 
 from .config import settings
 
+def _json_serializer(value: Any) -> str:
+    """orjson for JSON/JSONB bind values - SQLAlchemy expects str, not bytes"""
+    return orjson.dumps(value).decode()
+
 # Create SQLAlchemy engine
 engine = create_engine(
     settings.database_url,
     connect_args={"check_same_thread": False} if "sqlite" in settings.database_url else {},
-    echo=settings.debug  # SQL query logging in debug mode
+    echo=settings.debug,  # SQL query logging in debug mode
+    # Every JSON column read/write goes through these two hooks
+    json_serializer=_json_serializer,
+    json_deserializer=orjson.loads
 )
 
 # Create SessionLocal class
@@ -34,9 +43,54 @@ def get_db() -> Generator[Session, None, None]:
     finally:
         db.close()
 
+def _model_metadata():
+    """Metadata the models are declared on (app.models.base, not the Base above)"""
+    from app.models import Base as ModelBase
+    return ModelBase.metadata
+
 def create_tables():
     """
     Create all database tables
-    Used for initial setup and testing
+    Used for initial setup and testing - skips DDL entirely when every table already exists
+    """
+    metadata = _model_metadata()
+    missing_tables = set(metadata.tables) - set(inspect(engine).get_table_names())
+    if missing_tables:
+        metadata.create_all(bind=engine)
+    verify_schema()
+
+def _sqlite_file_missing(bind) -> bool:
+    """True for a file-backed SQLite URL whose file is not there - connecting would create it empty"""
+    url = bind.engine.url  # Engine or Connection
+    if url.get_backend_name() != "sqlite" or url.database in (None, "", ":memory:"):
+        return False
+    if url.database.startswith("file:"):
+        return False  # URI filenames carry their own mode
+    return not os.path.exists(url.database)
+
+def missing_columns(bind=None) -> Dict[str, List[str]]:
+    """Model columns absent from tables that already exist - drift create_all cannot repair"""
+    bind = bind or engine
+    if _sqlite_file_missing(bind):
+        return {}  # No database yet - nothing to drift from, and inspecting would leave a 0-byte file
+    inspector = inspect(bind)
+    existing_tables = set(inspector.get_table_names())
+    missing = {}
+    for table in _model_metadata().sorted_tables:
+        if table.name not in existing_tables:
+            continue
+        columns = {column["name"] for column in inspector.get_columns(table.name)}
+        absent = [column.name for column in table.columns if column.name not in columns]
+        if absent:
+            missing[table.name] = absent
+    return missing
+
+def verify_schema(bind=None):
+    """
+    Fail fast when the database predates the models
+    Otherwise every query on the affected table errors with 'no such column'
     """
-    Base.metadata.create_all(bind=engine)
+    missing = missing_columns(bind)
+    if missing:
+        details = "; ".join(f"{table}: {', '.join(columns)}" for table, columns in missing.items())
+        raise RuntimeError(f"❌ Database schema is out of date ({details}) - run `python migrate.py`")
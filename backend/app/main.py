@@ -8,7 +8,7 @@ from fastapi.middleware.cors import CORSMiddleware
 import logging
 
 from app.core.config import settings
-from app.core.database import engine
+from app.core.database import engine, verify_schema
 from app.models import user, course, memory  # Import all models
 from app.api.v1.api import api_router
 
@@ -69,6 +69,7 @@ async def root():
 @app.on_event("startup")
 async def startup_event():
     logger.info("🚀 Harv v2.0 starting up...")
+    verify_schema()  # Columns added by migrate.py (e.g. modules.concepts_count) must exist
     logger.info("🧠 Enhanced Memory System: ACTIVE")
     logger.info("🤖 OpenAI Integration: ACTIVE") 
     logger.info("📚 API Documentation: /docs")
@@ -3,22 +3,36 @@ Course and module models - FIXED VERSION
 Your 15 communication modules with Socratic configuration + Document Intelligence
 """
 
-from sqlalchemy import Column, Integer, String, Text, Boolean, DateTime
+from sqlalchemy import Column, Integer, String, Text, Boolean, DateTime, Index, JSON, text
+from sqlalchemy import select, func, case, and_, literal_column
+from sqlalchemy.dialects.postgresql import JSONB
 from sqlalchemy.orm import relationship
-from typing import Dict, List
-from datetime import datetime
-import json
+from typing import Dict, List, Optional
+import copy
 
 from .base import Base, TimestampMixin
 
+# Parsed by the driver (JSONB on Postgres, JSON text on SQLite) - assign dicts, not json.dumps strings
+DocumentJSON = JSON(none_as_null=True).with_variant(JSONB(none_as_null=True), "postgresql")
+
 class Module(Base, TimestampMixin):
     """
     Learning module model
     Contains your 15 communication modules with Socratic prompts + Document Intelligence
     """
     __tablename__ = "modules"
+    __table_args__ = (
+        # Partial index over the modules that actually carry a processed document
+        Index(
+            "ix_module_has_doc", "id",
+            postgresql_where=text("document_processed_at IS NOT NULL"),
+            sqlite_where=text("document_processed_at IS NOT NULL")
+        ),
+        # For server-side concept filtering - same name as the JSONB alembic revision, Postgres only
+        Index("ix_modules_concepts_gin", "extracted_concepts", postgresql_using="gin").ddl_if(dialect="postgresql"),
+    )
     
-    id = Column(Integer, primary_key=True, index=True)
+    id = Column(Integer, primary_key=True)
     title = Column(String, nullable=False)
     description = Column(Text)
     
@@ -47,10 +61,12 @@ class Module(Base, TimestampMixin):
     source_document_name = Column(String, nullable=True)
     source_document_type = Column(String, nullable=True)
     document_processed_at = Column(DateTime, nullable=True)
-    extracted_concepts = Column(Text, nullable=True)
-    extracted_examples = Column(Text, nullable=True)
-    socratic_questions = Column(Text, nullable=True)
+    extracted_concepts = Column(DocumentJSON, nullable=True)
+    extracted_examples = Column(DocumentJSON, nullable=True)
+    socratic_questions = Column(DocumentJSON, nullable=True)
     document_summary = Column(Text, nullable=True)
+    concepts_count = Column(Integer, default=0)  # Denormalized len(extracted_concepts)
+    examples_count = Column(Integer, default=0)  # Denormalized len(extracted_examples)
     
     # Relationships
     conversations = relationship("Conversation", back_populates="module")
@@ -63,31 +79,18 @@ class Module(Base, TimestampMixin):
         return bool(self.extracted_concepts and self.extracted_examples)
     
     def get_document_concepts(self) -> Dict[str, str]:
-        """Get extracted concepts as dictionary"""
-        if not self.extracted_concepts:
-            return {}
-        try:
-            return json.loads(self.extracted_concepts)
-        except (json.JSONDecodeError, TypeError):
-            return {}
+        """Get extracted concepts as dictionary (a copy - edits don't leak into the loaded row)"""
+        return dict(self.extracted_concepts or {})
     
     def get_document_examples(self) -> Dict[str, str]:
-        """Get extracted examples as dictionary"""
-        if not self.extracted_examples:
-            return {}
-        try:
-            return json.loads(self.extracted_examples)
-        except (json.JSONDecodeError, TypeError):
-            return {}
+        """Get extracted examples as dictionary (a copy - edits don't leak into the loaded row)"""
+        return dict(self.extracted_examples or {})
     
     def get_socratic_questions(self) -> Dict[str, List[str]]:
-        """Get generated Socratic questions as dictionary"""
+        """Get generated Socratic questions as dictionary (a deep copy - the lists are mutable too)"""
         if not self.socratic_questions:
             return {"concept_questions": [], "application_questions": []}
-        try:
-            return json.loads(self.socratic_questions)
-        except (json.JSONDecodeError, TypeError):
-            return {"concept_questions": [], "application_questions": []}
+        return copy.deepcopy(self.socratic_questions)
     
     def get_document_status(self) -> Dict[str, any]:
         """Get complete document intelligence status"""
@@ -95,9 +98,9 @@ class Module(Base, TimestampMixin):
             "has_document": self.has_document_intelligence(),
             "document_name": self.source_document_name,
             "document_type": self.source_document_type,
-            "processed_at": self.document_processed_at.isoformat() if self.document_processed_at else None,
-            "concepts_count": len(self.get_document_concepts()),
-            "examples_count": len(self.get_document_examples()),
+            "processed_at": self.document_processed_at,  # datetime - the response serializer formats it
+            "concepts_count": self.concepts_count or 0,
+            "examples_count": self.examples_count or 0,
             "questions_available": bool(self.socratic_questions)
         }
     
@@ -111,3 +114,68 @@ class Module(Base, TimestampMixin):
         self.extracted_examples = None
         self.socratic_questions = None
         self.document_summary = None
+        self.concepts_count = 0
+        self.examples_count = 0
+
+def _json_entry_count(column, dialect: str):
+    """SQL for len() of a JSON column's value (0 when NULL or not a container)"""
+    if dialect == "postgresql":
+        keys = func.jsonb_object_keys(column).table_valued("key")
+        return case(
+            (func.jsonb_typeof(column) == "object", select(func.count()).select_from(keys).scalar_subquery()),
+            (func.jsonb_typeof(column) == "array", func.jsonb_array_length(column)),
+            else_=0
+        )
+    entries = func.json_each(column).table_valued("key")
+    return case(
+        (func.json_valid(column), select(func.count()).select_from(entries).scalar_subquery()),
+        else_=0
+    )
+
+def has_document_clause(dialect: str):
+    """SQL twin of Module.has_document_intelligence() - both concepts and examples non-empty"""
+    return and_(
+        _json_entry_count(Module.extracted_concepts, dialect) > 0,
+        _json_entry_count(Module.extracted_examples, dialect) > 0
+    )
+
+def questions_available_clause(dialect: str):
+    """SQL twin of bool(Module.socratic_questions)"""
+    return _json_entry_count(Module.socratic_questions, dialect) > 0
+
+def _isoformat_sql(column, dialect: str):
+    """SQL rendering of datetime.isoformat() for a naive timestamp column (NULL stays NULL)"""
+    if dialect == "postgresql":
+        text_value = func.to_char(column, 'YYYY-MM-DD"T"HH24:MI:SS.US')
+    else:
+        text_value = func.replace(column, " ", "T")  # Stored as 'YYYY-MM-DD HH:MM:SS.ffffff'
+    # isoformat() drops the fraction when microseconds are zero
+    return func.replace(text_value, ".000000", "")
+
+def document_status_json(db, module_id: int) -> Optional[str]:
+    """
+    Build the get_document_status() payload in the database and return it as JSON text
+    Nothing is parsed in Python - handlers can forward the string as the response body
+    """
+    dialect = db.bind.dialect.name
+    if dialect == "postgresql":
+        build_object = func.json_build_object
+        as_bool = lambda expr: expr
+    else:
+        build_object = func.json_object
+        as_bool = lambda expr: func.json(case((expr, "true"), else_="false"))
+    
+    fields = {
+        "module_id": Module.id,
+        "module_title": Module.title,
+        "has_document": as_bool(has_document_clause(dialect)),
+        "document_name": Module.source_document_name,
+        "document_type": Module.source_document_type,
+        "processed_at": _isoformat_sql(Module.document_processed_at, dialect),
+        "concepts_count": func.coalesce(Module.concepts_count, 0),
+        "examples_count": func.coalesce(Module.examples_count, 0),
+        "questions_available": as_bool(questions_available_clause(dialect)),
+    }
+    # Keys are inlined as SQL string literals so Postgres doesn't need to infer bind types
+    args = [arg for key, expr in fields.items() for arg in (literal_column(f"'{key}'"), expr)]
+    return db.execute(select(build_object(*args)).where(Module.id == module_id)).scalar()
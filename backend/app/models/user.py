@@ -10,7 +10,7 @@ class User(Base, TimestampMixin):
     """Enhanced User model with demo role support"""
     __tablename__ = "users"
     
-    id = Column(Integer, primary_key=True, index=True)
+    id = Column(Integer, primary_key=True)
     email = Column(String, unique=True, index=True, nullable=False)
     hashed_password = Column(String, nullable=False)
     name = Column(String, nullable=False)
@@ -59,7 +59,7 @@ class OnboardingSurvey(Base, TimestampMixin):
     """Onboarding survey model for learning style assessment"""
     __tablename__ = "onboarding_surveys"
     
-    id = Column(Integer, primary_key=True, index=True)
+    id = Column(Integer, primary_key=True)
     user_id = Column(Integer, nullable=False)  # Foreign key to User
     learning_style = Column(String)  # visual, auditory, kinesthetic, reading
     preferred_pace = Column(String)  # slow, medium, fast
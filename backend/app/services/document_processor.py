@@ -59,8 +59,8 @@ class UniversalDocumentProcessor:
             logger.info(f"📄 Processing document for Module {module_id}: {file_path}")
             print(f"📄 Processing document for Module {module_id}: {file_path}")
             
-            # Get the target module
-            module = db_session.query(Module).filter(Module.id == module_id).first()
+            # Get the target module - an identity-map hit when the caller already loaded it
+            module = db_session.get(Module, module_id)
             if not module:
                 result["error"] = f"Module {module_id} not found"
                 return result
@@ -308,10 +308,14 @@ class UniversalDocumentProcessor:
             module.source_document_type = Path(file_path).suffix.lower()[1:]
             module.document_processed_at = datetime.utcnow()
             
-            # Store extracted intelligence as JSON strings
-            module.extracted_concepts = json.dumps(ai_analysis.get('key_concepts', {}))
-            module.extracted_examples = json.dumps(ai_analysis.get('real_world_examples', {}))
-            module.socratic_questions = json.dumps(ai_analysis.get('socratic_questions', {}))
+            # Store extracted intelligence - JSON columns, serialized by the engine
+            concepts = ai_analysis.get('key_concepts', {})
+            examples = ai_analysis.get('real_world_examples', {})
+            module.extracted_concepts = concepts
+            module.extracted_examples = examples
+            module.socratic_questions = ai_analysis.get('socratic_questions', {})
+            module.concepts_count = len(concepts)
+            module.examples_count = len(examples)
             module.document_summary = ai_analysis.get('document_summary', '')
             
             # Optionally enhance system prompt with document knowledge
@@ -328,8 +332,8 @@ class UniversalDocumentProcessor:
             print(f"✅ Module {module.id} successfully updated with document intelligence:")
             print(f"   - Document: {module.source_document_name}")
             print(f"   - Processed: {module.document_processed_at}")
-            print(f"   - Concepts stored: {len(json.loads(module.extracted_concepts))}")
-            print(f"   - Examples stored: {len(json.loads(module.extracted_examples))}")
+            print(f"   - Concepts stored: {len(concepts)}")
+            print(f"   - Examples stored: {len(examples)}")
             
             logger.info(f"✅ Module {module.id} updated with document intelligence")
             return True
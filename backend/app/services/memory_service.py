@@ -1,9 +1,10 @@
-from typing import Dict, List, Optional, Any
+from typing import Dict, List, Optional, Any, Tuple
 from datetime import datetime, timedelta
 from sqlalchemy.orm import Session
-from sqlalchemy import desc, func
+from sqlalchemy import desc, func, select
 import json
 import logging
+import msgspec
 
 from app.models import (
     User, OnboardingSurvey, Module, Conversation, 
@@ -12,6 +13,26 @@ from app.models import (
 
 logger = logging.getLogger(__name__)
 
+# Plain mirrors of the columns layers 1 and 2 read - Core rows are converted straight
+# into these, skipping ORM identity-map and attribute instrumentation
+class UserProfileRow(msgspec.Struct):
+    name: Optional[str] = None
+
+class SurveyRow(msgspec.Struct):
+    learning_style: Optional[str] = None
+    preferred_pace: Optional[str] = None
+    interaction_preference: Optional[str] = None
+    goals: Optional[str] = None
+
+class ProgressRow(msgspec.Struct):
+    completion_percentage: Optional[float] = 0
+    mastery_level: Optional[str] = 'beginner'
+
+class ModuleRow(msgspec.Struct):
+    id: int
+    title: Optional[str] = None
+    description: Optional[str] = None
+
 class EnhancedMemoryService:
     """
     4-Layer Enhanced Memory System - COMPLETE FIXED VERSION
@@ -39,15 +60,10 @@ class EnhancedMemoryService:
         FIXED: Now includes conversation_id parameter for chat integration
         """
         try:
-            user = self.db.query(User).filter(User.id == user_id).first()
-            if not user:
-                raise ValueError(f"User {user_id} not found")
-            
             logger.info(f"🧠 Assembling memory for user {user_id}, module {module_id}")
             
-            # Assemble all 4 layers
-            layer1 = await self._assemble_layer1_user_profile(user_id)
-            layer2 = await self._assemble_layer2_module_context(module_id)
+            # Assemble all 4 layers - 1 and 2 share one query, which also checks the user exists
+            layer1, layer2 = await self._assemble_layers_1_and_2(user_id, module_id)
             layer3 = await self._assemble_layer3_conversation_state(user_id, module_id, conversation_id)
             layer4 = await self._assemble_layer4_knowledge_connections(user_id, module_id)
             
@@ -103,33 +119,112 @@ class EnhancedMemoryService:
                 "success": False
             }
     
+    async def _assemble_layers_1_and_2(self, user_id: int, module_id: int) -> Tuple[Dict[str, Any], Dict[str, Any]]:
+        """
+        Layers 1 and 2 from one joined query - user, survey and module in a single round trip
+        Raises ValueError when the user does not exist
+        """
+        try:
+            # SAVEPOINT - a failed survey join must not roll back the caller's pending work
+            with self.db.begin_nested():
+                row = self.db.execute(self._layers_1_and_2_query(user_id, module_id, with_survey=True)).first()
+        except Exception as e:
+            # Same guard the separate survey lookup has - a broken survey table only costs the survey
+            logger.warning(f"Survey join failed, assembling without survey: {str(e)}")
+            row = self.db.execute(self._layers_1_and_2_query(user_id, module_id, with_survey=False)).first()
+        if not row:
+            raise ValueError(f"User {user_id} not found")
+        
+        try:
+            survey = (
+                msgspec.convert(row, SurveyRow, from_attributes=True)
+                if getattr(row, "survey_id", None) is not None else None
+            )
+        except Exception:
+            survey = None
+        
+        try:
+            user = msgspec.convert(row, UserProfileRow, from_attributes=True)
+            layer1 = self._build_layer1_user_profile(user, survey, self._load_progress_records(user_id))
+        except Exception as e:
+            layer1 = self._layer1_fallback(e)
+        
+        try:
+            module = msgspec.convert(row, ModuleRow, from_attributes=True) if row.id is not None else None
+            layer2 = self._build_layer2_module_context(module_id, module)
+        except Exception as e:
+            layer2 = self._layer2_fallback(module_id, e)
+        
+        return layer1, layer2
+    
+    def _layers_1_and_2_query(self, user_id: int, module_id: int, with_survey: bool):
+        """User (+ first onboarding survey) + module columns for layers 1 and 2"""
+        columns = [User.name, Module.id, Module.title, Module.description]
+        if with_survey:
+            columns += [
+                OnboardingSurvey.id.label("survey_id"),
+                OnboardingSurvey.learning_style,
+                OnboardingSurvey.preferred_pace,
+                OnboardingSurvey.interaction_preference,
+                OnboardingSurvey.goals
+            ]
+        stmt = select(*columns).select_from(User)
+        if with_survey:
+            stmt = stmt.outerjoin(OnboardingSurvey, OnboardingSurvey.user_id == User.id)
+        return stmt.outerjoin(Module, Module.id == module_id).where(User.id == user_id).limit(1)
+    
     async def _assemble_layer1_user_profile(self, user_id: int) -> Dict[str, Any]:
         """Layer 1: User Learning Profile & Cross-Module Mastery"""
         try:
-            user = self.db.query(User).filter(User.id == user_id).first()
+            row = self.db.execute(select(User.name).where(User.id == user_id)).first()
+            user = msgspec.convert(row, UserProfileRow, from_attributes=True)
             
             # Get onboarding survey if exists
             try:
-                survey = self.db.query(OnboardingSurvey).filter(OnboardingSurvey.user_id == user_id).first()
+                row = self.db.execute(
+                    select(
+                        OnboardingSurvey.learning_style,
+                        OnboardingSurvey.preferred_pace,
+                        OnboardingSurvey.interaction_preference,
+                        OnboardingSurvey.goals
+                    ).where(OnboardingSurvey.user_id == user_id).limit(1)
+                ).first()
+                survey = msgspec.convert(row, SurveyRow, from_attributes=True) if row else None
             except:
                 survey = None
             
-            # Get cross-module progress if table exists
-            try:
-                progress_records = self.db.query(UserProgress).filter(
+            return self._build_layer1_user_profile(user, survey, self._load_progress_records(user_id))
+            
+        except Exception as e:
+            return self._layer1_fallback(e)
+    
+    def _load_progress_records(self, user_id: int) -> List[ProgressRow]:
+        """Cross-module progress rows, empty if the table is missing"""
+        try:
+            rows = self.db.execute(
+                select(UserProgress.completion_percentage, UserProgress.mastery_level).where(
                     UserProgress.user_id == user_id,
                     UserProgress.completion_percentage > 0
-                ).all()
-            except:
-                progress_records = []
-            
-            # Calculate mastery overview
-            total_modules = len(progress_records)
-            avg_completion = sum(getattr(p, 'completion_percentage', 0) for p in progress_records) / max(total_modules, 1)
-            mastery_levels = [getattr(p, 'mastery_level', 'beginner') for p in progress_records]
-            
-            # Build profile content
-            profile_content = f"""🎓 STUDENT LEARNING PROFILE:
+                )
+            ).all()
+            return msgspec.convert(rows, List[ProgressRow], from_attributes=True)
+        except:
+            return []
+    
+    def _build_layer1_user_profile(
+        self, 
+        user: UserProfileRow, 
+        survey: Optional[SurveyRow], 
+        progress_records: List[ProgressRow]
+    ) -> Dict[str, Any]:
+        """Render the layer 1 profile from already-loaded rows"""
+        # Calculate mastery overview
+        total_modules = len(progress_records)
+        avg_completion = sum(p.completion_percentage or 0 for p in progress_records) / max(total_modules, 1)
+        mastery_levels = [getattr(p, 'mastery_level', 'beginner') for p in progress_records]
+        
+        # Build profile content
+        profile_content = f"""🎓 STUDENT LEARNING PROFILE:
 Name: {user.name}
 Learning Style: {getattr(survey, 'learning_style', 'Visual') if survey else 'Visual + Interactive'}
 Preferred Pace: {getattr(survey, 'preferred_pace', 'Moderate') if survey else 'Moderate'}
@@ -147,60 +242,71 @@ Mastery Levels: {', '.join(set(mastery_levels)) if mastery_levels else 'Beginnin
 - Responds well to question-based learning
 - Prefers practical examples and real-world applications
 - Benefits from connecting concepts across modules"""
-            
-            return {
-                "layer": "user_profile",
-                "content": profile_content,
-                "metadata": {
-                    "modules_started": total_modules,
-                    "average_completion": avg_completion,
-                    "mastery_levels": mastery_levels,
-                    "learning_style": getattr(survey, 'learning_style', 'visual') if survey else "visual",
-                    "preferred_pace": getattr(survey, 'preferred_pace', 'moderate') if survey else "moderate"
-                }
-            }
-            
-        except Exception as e:
-            logger.error(f"Layer 1 assembly failed: {str(e)}")
-            return {
-                "layer": "user_profile", 
-                "content": "🎓 New learner beginning their communication journey. Ready to discover through questions and dialogue.",
-                "error": str(e)
+        
+        return {
+            "layer": "user_profile",
+            "content": profile_content,
+            "metadata": {
+                "modules_started": total_modules,
+                "average_completion": avg_completion,
+                "mastery_levels": mastery_levels,
+                "learning_style": getattr(survey, 'learning_style', 'visual') if survey else "visual",
+                "preferred_pace": getattr(survey, 'preferred_pace', 'moderate') if survey else "moderate"
             }
+        }
+    
+    def _layer1_fallback(self, e: Exception) -> Dict[str, Any]:
+        """Generic learner profile when layer 1 cannot be built"""
+        logger.error(f"Layer 1 assembly failed: {str(e)}")
+        return {
+            "layer": "user_profile", 
+            "content": "🎓 New learner beginning their communication journey. Ready to discover through questions and dialogue.",
+            "error": str(e)
+        }
     
     async def _assemble_layer2_module_context(self, module_id: int) -> Dict[str, Any]:
         """Layer 2: Current Module Context & Socratic Configuration"""
         try:
-            module = self.db.query(Module).filter(Module.id == module_id).first()
-            if not module:
-                return {
-                    "layer": "module_context", 
-                    "content": f"📚 Module {module_id}: Communication fundamentals with Socratic methodology active.",
-                    "error": "Module not found"
-                }
-            
-            # Use description field safely
-            module_description = getattr(module, 'description', f'Communication skills module focusing on practical learning')
-            
-            # Create learning objectives based on module
-            objectives_map = {
-                1: ["Master verbal communication techniques", "Understand nonverbal communication", "Apply active listening skills"],
-                2: ["Develop persuasive communication", "Build professional presentation skills", "Handle difficult conversations"],
-                3: ["Practice group communication", "Lead effective meetings", "Facilitate team discussions"]
-            }
-            
-            objectives = objectives_map.get(module_id, ["Develop communication skills", "Apply theoretical knowledge", "Build practical competence"])
+            row = self.db.execute(
+                select(Module.id, Module.title, Module.description).where(Module.id == module_id)
+            ).first()
+            module = msgspec.convert(row, ModuleRow, from_attributes=True) if row else None
+            return self._build_layer2_module_context(module_id, module)
             
-            # Create key concepts
-            concepts_map = {
-                1: ["Message clarity", "Active listening", "Nonverbal awareness", "Feedback loops"],
-                2: ["Persuasion techniques", "Professional tone", "Conflict resolution", "Presentation skills"],
-                3: ["Group dynamics", "Meeting facilitation", "Team communication", "Leadership presence"]
+        except Exception as e:
+            return self._layer2_fallback(module_id, e)
+    
+    def _build_layer2_module_context(self, module_id: int, module: Optional[ModuleRow]) -> Dict[str, Any]:
+        """Render the layer 2 module context from an already-loaded row"""
+        if not module:
+            return {
+                "layer": "module_context", 
+                "content": f"📚 Module {module_id}: Communication fundamentals with Socratic methodology active.",
+                "error": "Module not found"
             }
-            
-            key_concepts = concepts_map.get(module_id, ["Communication theory", "Practical application", "Socratic dialogue"])
-            
-            module_content = f"""📚 CURRENT MODULE CONTEXT:
+        
+        # Use description field safely
+        module_description = getattr(module, 'description', f'Communication skills module focusing on practical learning')
+        
+        # Create learning objectives based on module
+        objectives_map = {
+            1: ["Master verbal communication techniques", "Understand nonverbal communication", "Apply active listening skills"],
+            2: ["Develop persuasive communication", "Build professional presentation skills", "Handle difficult conversations"],
+            3: ["Practice group communication", "Lead effective meetings", "Facilitate team discussions"]
+        }
+        
+        objectives = objectives_map.get(module_id, ["Develop communication skills", "Apply theoretical knowledge", "Build practical competence"])
+        
+        # Create key concepts
+        concepts_map = {
+            1: ["Message clarity", "Active listening", "Nonverbal awareness", "Feedback loops"],
+            2: ["Persuasion techniques", "Professional tone", "Conflict resolution", "Presentation skills"],
+            3: ["Group dynamics", "Meeting facilitation", "Team communication", "Leadership presence"]
+        }
+        
+        key_concepts = concepts_map.get(module_id, ["Communication theory", "Practical application", "Socratic dialogue"])
+        
+        module_content = f"""📚 CURRENT MODULE CONTEXT:
 Module {module_id}: {module.title}
 Description: {module_description}
 
@@ -218,26 +324,27 @@ Teaching Approach:
 • Encourage critical thinking about communication principles
 • Connect theoretical concepts to real-world applications
 • Maintain 70%+ questions in responses to promote active learning"""
-            
-            return {
-                "layer": "module_context",
-                "content": module_content,
-                "metadata": {
-                    "module_id": module_id,
-                    "module_title": module.title,
-                    "objectives_count": len(objectives),
-                    "concepts_count": len(key_concepts),
-                    "socratic_mode": True
-                }
-            }
-            
-        except Exception as e:
-            logger.error(f"Layer 2 assembly failed: {str(e)}")
-            return {
-                "layer": "module_context", 
-                "content": f"📚 Module {module_id}: Communication skills with Socratic methodology. Focus on guided discovery through questions.",
-                "error": str(e)
+        
+        return {
+            "layer": "module_context",
+            "content": module_content,
+            "metadata": {
+                "module_id": module_id,
+                "module_title": module.title,
+                "objectives_count": len(objectives),
+                "concepts_count": len(key_concepts),
+                "socratic_mode": True
             }
+        }
+    
+    def _layer2_fallback(self, module_id: int, e: Exception) -> Dict[str, Any]:
+        """Generic module context when layer 2 cannot be built"""
+        logger.error(f"Layer 2 assembly failed: {str(e)}")
+        return {
+            "layer": "module_context", 
+            "content": f"📚 Module {module_id}: Communication skills with Socratic methodology. Focus on guided discovery through questions.",
+            "error": str(e)
+        }
     
     async def _assemble_layer3_conversation_state(self, user_id: int, module_id: int, conversation_id: str = None) -> Dict[str, Any]:
         """Layer 3: Real-time Conversation State"""
@@ -593,13 +700,14 @@ Use Socratic questioning to guide student learning:
             if not conversation:
                 return None
             
-            # Get messages
+            # Get messages - streamed in batches of 100 so long conversations never hold
+            # every ORM Message at once; each is released after becoming a dict
             messages = []
             try:
                 msgs = self.db.query(Message).filter(
                     Message.conversation_id == conversation_id
-                ).order_by(Message.created_at).all()
-                messages = msgs
+                ).order_by(Message.created_at).execution_options(yield_per=100)
+                messages = [{"content": m.content, "is_user": getattr(m, 'is_user', True)} for m in msgs]
             except:
                 pass
             
@@ -608,7 +716,7 @@ Use Socratic questioning to guide student learning:
                 "module_id": conversation.module_id,
                 "message_count": len(messages),
                 "created_at": conversation.created_at,
-                "messages": [{"content": m.content, "is_user": getattr(m, 'is_user', True)} for m in messages]
+                "messages": messages
             }
             
         except Exception as e:
@@ -3,7 +3,6 @@ OpenAI Service - GPT-4o with Modern API
 """
 
 from openai import AsyncOpenAI
-import asyncio
 import logging
 import time
 from typing import Dict, List, Any, Optional
@@ -54,14 +53,14 @@ class OpenAIService:
         self.temperature = 0.7
         self.request_count = 0
         
-        logger.info(f"🤖 OpenAI Service - Model: {self.model}, Demo: {self.demo_mode}")
+        logger.info("🤖 OpenAI Service - Model: %s, Demo: %s", self.model, self.demo_mode)
 
     async def generate_socratic_response(self, enhanced_memory_context: str, user_message: str, conversation_history: List[Dict[str, str]] = None, module_id: int = 1) -> OpenAIResponse:
         start_time = time.time()
         
         try:
             if self.demo_mode:
-                return await self._generate_demo_response(user_message, module_id)
+                return self._generate_demo_response(user_message, module_id)
             
             system_prompt = f"""You are an expert AI tutor using GPT-4o and the Socratic method.
 
@@ -91,21 +90,7 @@ Guide through questions, not answers."""
             ai_response = response.choices[0].message.content.strip()
             
             # Analyze Socratic compliance
-            question_count = ai_response.count("?")
-            sentences = len([s for s in ai_response.split(".") if s.strip()])
-            question_ratio = question_count / max(sentences, 1)
-            
-            compliance = "HIGH" if question_ratio >= 0.7 else "MEDIUM" if question_ratio >= 0.4 else "LOW"
-            effectiveness = 0.9 if compliance == "HIGH" else 0.7 if compliance == "MEDIUM" else 0.4
-            
-            socratic_analysis = SocraticAnalysis(
-                question_count=question_count,
-                socratic_compliance=compliance,
-                engagement_level="HIGH" if question_count >= 3 else "MEDIUM",
-                teaching_approach="Socratic questioning",
-                effectiveness_score=effectiveness,
-                has_direct_answers=False
-            )
+            socratic_analysis = self._analyze_socratic_compliance(ai_response, user_message)
             
             # Calculate costs
             input_cost = (response.usage.prompt_tokens / 1000000) * 5.0
@@ -132,7 +117,24 @@ Guide through questions, not answers."""
         except Exception as e:
             return OpenAIResponse(success=False, error=str(e))
 
-    async def _generate_demo_response(self, user_message: str, module_id: int) -> OpenAIResponse:
+    def _analyze_socratic_compliance(self, ai_response: str, user_message: str) -> SocraticAnalysis:
+        question_count = ai_response.count("?")
+        sentences = len([s for s in ai_response.split(".") if s.strip()])
+        question_ratio = question_count / max(sentences, 1)
+        
+        compliance = "HIGH" if question_ratio >= 0.7 else "MEDIUM" if question_ratio >= 0.4 else "LOW"
+        effectiveness = 0.9 if compliance == "HIGH" else 0.7 if compliance == "MEDIUM" else 0.4
+        
+        return SocraticAnalysis(
+            question_count=question_count,
+            socratic_compliance=compliance,
+            engagement_level="HIGH" if question_count >= 3 else "MEDIUM",
+            teaching_approach="Socratic questioning",
+            effectiveness_score=effectiveness,
+            has_direct_answers=False
+        )
+
+    def _generate_demo_response(self, user_message: str, module_id: int) -> OpenAIResponse:
         demo_response = "That's an interesting question! What do you think makes communication effective? How might you explore this concept further based on your own experiences?"
         
         return OpenAIResponse(
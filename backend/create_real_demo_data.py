@@ -2,225 +2,123 @@
 """
 Create Real Demo Data - NOT FAKE
 This creates actual database entries that the metrics will read from
+The dataset is static, so it ships as plain SQL in seed/demo_data.sql
 """
 
-import asyncio
-from sqlalchemy.orm import Session
-from app.core.database import SessionLocal, create_tables
-from app.models import Module, User, Conversation, Message, MemorySummary, UserProgress, OnboardingSurvey
-from app.core.security import get_password_hash
-from datetime import datetime, timedelta
-import json
+import re
+from pathlib import Path
+from sqlalchemy import create_engine, func, insert, select
+from app.core.database import engine, create_tables
+from app.models import Base
+from migrate_phase25 import finalize_indexes
 
-async def create_real_demo_data():
+SEED_SQL = Path(__file__).resolve().parent / "seed" / "demo_data.sql"
+
+# Row counts reported after loading, scoped to the demo user
+SUMMARY_SQL = """
+    SELECT
+        (SELECT COUNT(*) FROM modules),
+        (SELECT COUNT(*) FROM conversations WHERE user_id = u.id),
+        (SELECT COUNT(*) FROM messages m JOIN conversations c ON c.id = m.conversation_id WHERE c.user_id = u.id),
+        (SELECT COUNT(*) FROM memory_summaries WHERE user_id = u.id),
+        (SELECT COUNT(*) FROM user_progress WHERE user_id = u.id)
+    FROM users u
+    WHERE u.email = 'demo@harv.com'
+"""
+
+def seed_statements():
+    """The seed file split into single statements (each one ends a line with ';')"""
+    return [stmt for stmt in re.split(r";[ \t]*$", SEED_SQL.read_text(), flags=re.M) if stmt.strip()]
+
+def _values(row, **overrides):
+    """Staged row as INSERT values - database-assigned id dropped, foreign keys remapped"""
+    values = {key: value for key, value in row._mapping.items() if key != "id"}
+    values.update(overrides)
+    return values
+
+def copy_staged_seed(conn, staged):
+    """
+    Core INSERTs of the staged seed into any database
+    Skips rows that already exist by the same rules as the SQL file, so reloading stays safe
+    """
+    tables = Base.metadata.tables
+    users, surveys, modules = tables["users"], tables["onboarding_surveys"], tables["modules"]
+    conversations, messages = tables["conversations"], tables["messages"]
+    
+    staged_user = staged.execute(select(users).where(users.c.email == "demo@harv.com")).one()
+    user_id = conn.scalar(select(users.c.id).where(users.c.email == "demo@harv.com"))
+    if user_id is None:
+        user_id = conn.execute(insert(users).values(_values(staged_user))).inserted_primary_key[0]
+    
+    if not conn.scalar(select(func.count()).select_from(surveys).where(surveys.c.user_id == user_id)):
+        for row in staged.execute(select(surveys)):
+            conn.execute(insert(surveys).values(_values(row, user_id=user_id)))
+    
+    # Module ids are part of the dataset - copied as-is
+    existing_modules = set(conn.scalars(select(modules.c.id)))
+    module_rows = [dict(row._mapping) for row in staged.execute(select(modules)) if row.id not in existing_modules]
+    if module_rows:
+        conn.execute(insert(modules), module_rows)
+    
+    for conversation in staged.execute(select(conversations)):
+        conversation_id = conn.scalar(select(conversations.c.id).where(
+            conversations.c.user_id == user_id, conversations.c.module_id == conversation.module_id
+        ))
+        if conversation_id is None:
+            conversation_id = conn.execute(
+                insert(conversations).values(_values(conversation, user_id=user_id))
+            ).inserted_primary_key[0]
+        if not conn.scalar(select(func.count()).select_from(messages).where(messages.c.conversation_id == conversation_id)):
+            conn.execute(insert(messages), [
+                _values(row, conversation_id=conversation_id)
+                for row in staged.execute(
+                    select(messages).where(messages.c.conversation_id == conversation.id).order_by(messages.c.id)
+                )
+            ])
+    
+    # One row per (user, module) in both tables
+    for table in (tables["memory_summaries"], tables["user_progress"]):
+        existing = set(conn.scalars(select(table.c.module_id).where(table.c.user_id == user_id)))
+        rows = [_values(row, user_id=user_id) for row in staged.execute(select(table)) if row.module_id not in existing]
+        if rows:
+            conn.execute(insert(table), rows)
+
+def load_seed(conn):
+    """Run the seed file on SQLite; elsewhere load it into in-memory SQLite and copy the rows over"""
+    if conn.dialect.name == "sqlite":
+        for stmt in seed_statements():
+            conn.exec_driver_sql(stmt)
+        return
+    
+    # The seed file is SQLite SQL (INSERT OR IGNORE, datetime() offsets) - it stays the single source of the data
+    staging = create_engine("sqlite://")
+    Base.metadata.create_all(staging)
+    with staging.begin() as staged:
+        for stmt in seed_statements():
+            staged.exec_driver_sql(stmt)
+        copy_staged_seed(conn, staged)
+
+def create_real_demo_data():
     """Create actual demo data in database"""
     
     print("🗄️ Creating database tables...")
     create_tables()
     
-    db = SessionLocal()
+    # Plain INSERTs through the configured engine in one transaction - no ORM objects or session bookkeeping
+    print(f"🌱 Loading {SEED_SQL.name}...")
     
     try:
-        # Create demo user
-        print("👤 Creating demo user...")
-        demo_user = db.query(User).filter(User.email == "demo@harv.com").first()
-        if not demo_user:
-            demo_user = User(
-                email="demo@harv.com",
-                name="Demo User",
-                hashed_password=get_password_hash("demo123"),
-                is_active=True
+        with engine.begin() as conn:
+            load_seed(conn)
+            module_count, conversation_count, message_count, memory_count, progress_count = (
+                conn.exec_driver_sql(SUMMARY_SQL).one()
             )
-            db.add(demo_user)
-            db.flush()
-            
-            # Create real onboarding data
-            onboarding = OnboardingSurvey(
-                user_id=demo_user.id,
-                learning_style="visual",
-                preferred_pace="moderate",
-                background_info="Interested in communication theory and media studies",
-                goals="Learn about mass communication and media effects",
-                interaction_preference="questions",
-                motivation_level="high",
-                time_availability="1-2 hours per week"
-            )
-            db.add(onboarding)
-            print(f"   ✅ Created user with ID {demo_user.id}")
-        
-        # Create real modules with full configuration
-        print("📚 Creating real learning modules...")
-        real_modules = [
-            {
-                "title": "Your Four Worlds",
-                "description": "Communication models, perception, and the four worlds we live in: private, public, ideal, and real",
-                "system_prompt": "Use Socratic questioning to guide students in discovering how perception shapes communication. Focus on helping them identify the four worlds: private (inner thoughts), public (shared reality), ideal (how things should be), and real (how things actually are). Never give direct answers - lead them to insights through strategic questions about their own experiences.",
-                "module_prompt": "Help students understand how different perceptual worlds create different communication realities. Ask them to consider examples from their daily life where they've experienced these different worlds.",
-                "learning_objectives": "Students will discover how perception influences communication, identify the four worlds of human experience, and understand how miscommunication often occurs when people are operating from different perceptual worlds.",
-                "difficulty_level": "beginner",
-                "estimated_duration": 45,
-                "is_active": True
-            },
-            {
-                "title": "Writing: The Persistence of Words",
-                "description": "How writing technology transformed human communication and enabled the preservation of knowledge across time",
-                "system_prompt": "Guide students to explore how writing technology revolutionized human communication. Use questions to help them discover the profound changes writing brought to society, memory, and knowledge transmission. Focus on the concept of 'persistence' - how writing makes words permanent.",
-                "module_prompt": "Focus on the revolutionary impact of written language on civilization. Help students understand how writing changed not just communication, but human consciousness itself.",
-                "learning_objectives": "Understand how writing technology changed human communication patterns, enabled complex societies, and transformed the way humans think and remember.",
-                "difficulty_level": "intermediate", 
-                "estimated_duration": 60,
-                "is_active": True
-            },
-            {
-                "title": "Books: Birth of Mass Communication",
-                "description": "The printing press revolution and how books became the first mass medium",
-                "system_prompt": "Help students discover how the printing press created the first mass communication medium. Use Socratic questioning to explore the social, cultural, and political impacts of mass-produced books. Guide them to understand how this technology democratized knowledge.",
-                "module_prompt": "Explore the social and cultural impacts of mass-produced books. Focus on how the printing press changed who could access information and how ideas spread through society.",
-                "learning_objectives": "Students will analyze how the printing press enabled true mass communication, understand its role in social change, and connect it to modern mass media principles.",
-                "difficulty_level": "intermediate",
-                "estimated_duration": 50,
-                "is_active": True
-            },
-            {
-                "title": "Mass Communication Theory",
-                "description": "Understanding mass media effects, theories, and their application to modern media",
-                "system_prompt": "Use questioning to guide students through major mass communication theories like agenda setting, cultivation theory, and uses and gratifications. Help them apply these theories to their own media consumption experiences.",
-                "module_prompt": "Focus on how mass communication theories explain media effects on individuals and society. Help students become critical consumers of media by understanding these theoretical frameworks.",
-                "learning_objectives": "Master key mass communication theories, understand their applications to modern media, and develop critical thinking skills about media influence.",
-                "difficulty_level": "advanced",
-                "estimated_duration": 75,
-                "is_active": True
-            },
-            {
-                "title": "Digital Revolution",
-                "description": "How digital technology is fundamentally transforming human communication and society",
-                "system_prompt": "Guide students to analyze the ongoing digital transformation of communication. Help them understand how digital media differs from traditional mass media and what implications this has for society, relationships, and democracy.",
-                "module_prompt": "Explore how digital technology is reshaping human interaction, information flow, and social structures. Focus on both opportunities and challenges of the digital age.",
-                "learning_objectives": "Understand the revolutionary impact of digital communication technologies, analyze their effects on society and individuals, and critically evaluate digital media trends.",
-                "difficulty_level": "advanced",
-                "estimated_duration": 60,
-                "is_active": True
-            }
-        ]
-        
-        created_modules = []
-        for i, module_data in enumerate(real_modules, 1):
-            existing = db.query(Module).filter(Module.id == i).first()
-            if not existing:
-                module = Module(**module_data)
-                db.add(module)
-                db.flush()
-                created_modules.append(module)
-                print(f"   ✅ Created module: {module.title}")
-        
-        # Create real conversations with actual message exchanges
-        print("💬 Creating real conversation data...")
-        conversation_count = 0
-        message_count = 0
-        
-        for module in created_modules[:3]:  # First 3 modules get conversations
-            conversation = Conversation(
-                user_id=demo_user.id,
-                module_id=module.id,
-                title=f"Exploring {module.title}",
-                is_active=True,
-                created_at=datetime.now() - timedelta(days=conversation_count)
-            )
-            db.add(conversation)
-            db.flush()
-            conversation_count += 1
-            
-            # Create realistic message exchange
-            messages = [
-                {
-                    "role": "user",
-                    "content": f"I'm curious about {module.title.lower()}. How does this relate to everyday communication?",
-                    "created_at": datetime.now() - timedelta(days=conversation_count, hours=2)
-                },
-                {
-                    "role": "assistant", 
-                    "content": f"That's an excellent question! Instead of me explaining it directly, let me ask you this: Can you think of a time recently when you experienced something related to {module.title.lower()} in your own life? What comes to mind?",
-                    "created_at": datetime.now() - timedelta(days=conversation_count, hours=2, minutes=5)
-                },
-                {
-                    "role": "user",
-                    "content": "I think I see what you mean. When I text my friends versus when I talk to my professor, I definitely communicate differently. Is that an example?",
-                    "created_at": datetime.now() - timedelta(days=conversation_count, hours=1, minutes=30)
-                },
-                {
-                    "role": "assistant",
-                    "content": f"Perfect observation! You've just identified a key principle. Now, what do you think drives those different communication choices? What's different about those two contexts that makes you adjust your approach?",
-                    "created_at": datetime.now() - timedelta(days=conversation_count, hours=1, minutes=25)
-                }
-            ]
-            
-            for msg_data in messages:
-                message = Message(
-                    conversation_id=conversation.id,
-                    role=msg_data["role"],
-                    content=msg_data["content"],
-                    token_count=len(msg_data["content"].split()),
-                    created_at=msg_data["created_at"],
-                    response_time=120 if msg_data["role"] == "assistant" else None
-                )
-                db.add(message)
-                message_count += 1
-        
-        print(f"   ✅ Created {conversation_count} conversations with {message_count} messages")
-        
-        # Create real memory summaries
-        print("🧠 Creating real memory summaries...")
-        memory_count = 0
-        
-        for module in created_modules[:3]:
-            memory = MemorySummary(
-                user_id=demo_user.id,
-                module_id=module.id,
-                what_learned=f"Discovered key concepts in {module.title} through guided questioning and reflection on personal communication experiences",
-                how_learned="Through Socratic dialogue that connected theoretical concepts to real-world examples from my daily life",
-                connections_made=f"Connected {module.title} principles to my experience with social media, texting, and face-to-face communication",
-                confidence_level=0.75 + (memory_count * 0.05),
-                retention_strength=0.85 + (memory_count * 0.03),
-                created_at=datetime.now() - timedelta(days=memory_count + 1)
-            )
-            db.add(memory)
-            memory_count += 1
-        
-        print(f"   ✅ Created {memory_count} memory summaries")
-        
-        # Create real progress records
-        print("📊 Creating real progress tracking...")
-        progress_count = 0
-        
-        for i, module in enumerate(created_modules):
-            completion = 25.0 + (i * 15) if i < 3 else 0.0  # Realistic varying progress
-            progress = UserProgress(
-                user_id=demo_user.id,
-                module_id=module.id,
-                completion_percentage=completion,
-                mastery_level="intermediate" if completion > 50 else "beginner",
-                total_conversations=1 if i < 3 else 0,
-                total_messages=4 if i < 3 else 0,
-                time_spent=(20 + i * 10) if i < 3 else 0,
-                insights_gained=2 + i if i < 3 else 0,
-                questions_asked=6 + (i * 2) if i < 3 else 0,
-                connections_made=1 + i if i < 3 else 0,
-                is_completed=completion >= 100,
-                updated_at=datetime.now() - timedelta(days=i)
-            )
-            db.add(progress)
-            progress_count += 1
-        
-        print(f"   ✅ Created {progress_count} progress records")
-        
-        # Commit all changes
-        db.commit()
         
         print("")
         print("🎉 REAL DEMO DATA CREATED SUCCESSFULLY!")
         print("=======================================")
         print(f"✅ Demo user: demo@harv.com / demo123")
-        print(f"✅ {len(created_modules)} learning modules with full Socratic configuration")
+        print(f"✅ {module_count} learning modules with full Socratic configuration")
         print(f"✅ {conversation_count} real conversations with {message_count} messages")
         print(f"✅ {memory_count} authentic memory summaries")
         print(f"✅ {progress_count} progress tracking records")
@@ -233,10 +131,9 @@ async def create_real_demo_data():
         
     except Exception as e:
         print(f"❌ Error creating demo data: {e}")
-        db.rollback()
         raise
-    finally:
-        db.close()
 
 if __name__ == "__main__":
-    asyncio.run(create_real_demo_data())
+    create_real_demo_data()
+    # Indexes deferred by `migrate_phase25.py --defer-indexes` are built once the data is in
+    finalize_indexes(engine.url.database)
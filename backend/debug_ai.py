@@ -14,10 +14,12 @@ def debug_openai():
     print("=" * 40)
     
     # Read your content
+    # Only the first 2000 characters go into the prompt, so never read more
+    content_path = '../module1_content.txt'
     try:
-        with open('../module1_content.txt', 'r') as f:
-            content = f.read()
-        print(f"✅ Loaded content: {len(content)} characters")
+        with open(content_path, 'rb') as f:
+            content = f.read(4096).decode('utf-8', 'ignore')[:2000]
+        print(f"✅ Loaded content: {os.path.getsize(content_path)} bytes")
     except:
         print("❌ Could not load ../module1_content.txt")
         return
@@ -38,7 +40,7 @@ def debug_openai():
     Extract key concepts from this educational content about communication theory.
     
     Content (first 2000 chars):
-    {content[:2000]}
+    {content}
     
     Return ONLY valid JSON with this structure:
     {{
@@ -54,31 +56,34 @@ def debug_openai():
     try:
         print("🤖 Calling OpenAI...")
         
-        response = client.chat.completions.create(
-            model="gpt-4",
+        # JSON mode needs no ```json fence stripping; stream and stop as soon as
+        # the top-level object closes instead of waiting for the full generation
+        stream = client.chat.completions.create(
+            model="gpt-4o",
             messages=[
                 {"role": "system", "content": "You are a helpful assistant. Return only valid JSON."},
                 {"role": "user", "content": prompt}
             ],
             temperature=0.3,
-            max_tokens=800
+            max_tokens=800,
+            response_format={"type": "json_object"},
+            stream=True
         )
         
-        result = response.choices[0].message.content.strip()
+        parts = []
+        depth = 0
+        for chunk in stream:
+            if not chunk.choices:
+                continue
+            piece = chunk.choices[0].delta.content or ""
+            parts.append(piece)
+            depth += piece.count("{") - piece.count("}")
+            if depth == 0 and piece.rstrip().endswith("}"):
+                break
         
-        print("📝 RAW RESPONSE:")
-        print("-" * 50)
-        print(result)
-        print("-" * 50)
-        
-        # Try to parse
-        if result.startswith("```json"):
-            result = result[7:]
-        if result.endswith("```"):
-            result = result[:-3]
-        result = result.strip()
+        result = "".join(parts).strip()
         
-        print("🧹 CLEANED RESPONSE:")
+        print("📝 RAW RESPONSE:")
         print("-" * 50)
         print(result)
         print("-" * 50)
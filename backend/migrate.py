@@ -0,0 +1,55 @@
+#!/usr/bin/env python3
+"""
+Run All Database Migrations
+Every migration step on one SQLite connection: one open, one WAL checkpoint
+"""
+
+import os
+import sqlite3
+import sys
+
+DB_PATH = "harv_v2.db"
+
+def connect(db_path=DB_PATH, create=False):
+    """
+    Open a migration connection
+    Shared-cache URI in autocommit mode so a running backend can keep reading;
+    WAL + NORMAL sync and a 64 MB page cache. Each step opens its own explicit transaction.
+    Without create=True a missing database raises instead of leaving an empty file behind.
+    """
+    mode = "rwc" if create else "rw"
+    conn = sqlite3.connect(f"file:{db_path}?mode={mode}&cache=shared", uri=True, isolation_level=None)
+    conn.executescript("PRAGMA journal_mode=WAL; PRAGMA synchronous=NORMAL; PRAGMA temp_store=MEMORY; PRAGMA cache_size=-65536;")
+    return conn
+
+def run_all_migrations(db_path=DB_PATH):
+    """Run every migration step in order on a single shared connection"""
+    # Imported here because each step imports connect() from this module
+    import migrate_database
+    import migrate_add_document_fields
+    import migrate_memory_system
+    import migrate_phase25
+    
+    print("🚀 Running all Harv v2.0 migrations...")
+    if not os.path.exists(db_path):
+        print(f"✅ No existing database found - creating {db_path}")
+    conn = connect(db_path, create=True)
+    
+    try:
+        # create_all runs first - the ALTER steps below expect the tables to exist
+        migrate_memory_system.migrate(conn)
+        migrate_database.migrate_database(conn)
+        if not migrate_add_document_fields.add_document_fields(conn):
+            return False
+        if not migrate_phase25.run_phase25_migration(conn=conn):
+            return False
+        
+        conn.execute("PRAGMA wal_checkpoint(TRUNCATE)")
+        print("🎉 All migrations complete!")
+        return True
+    finally:
+        conn.close()
+
+if __name__ == "__main__":
+    if not run_all_migrations():
+        sys.exit(1)
@@ -4,19 +4,25 @@ REAL Database Migration - Add Document Intelligence Fields
 This actually modifies your database structure
 """
 
-import sqlite3
 import os
 
-def add_document_fields():
-    """Add document intelligence fields to modules table"""
+from migrate import connect
+
+def add_document_fields(conn=None):
+    """
+    Add document intelligence fields to modules table
+    Pass conn to run on a shared migration connection (see migrate.py)
+    """
     
+    own_conn = conn is None
     db_path = "harv_v2.db"
-    if not os.path.exists(db_path):
+    if own_conn and not os.path.exists(db_path):
         print(f"❌ Database not found: {db_path}")
         return False
     
     try:
-        conn = sqlite3.connect(db_path)
+        if own_conn:
+            conn = connect(db_path)
         cursor = conn.cursor()
         
         print("🔄 Adding document intelligence fields to modules table...")
@@ -30,29 +36,64 @@ def add_document_fields():
             ("extracted_concepts", "TEXT"),
             ("extracted_examples", "TEXT"),
             ("socratic_questions", "TEXT"),
-            ("document_summary", "TEXT")
+            ("document_summary", "TEXT"),
+            ("concepts_count", "INTEGER DEFAULT 0"),
+            ("examples_count", "INTEGER DEFAULT 0")
         ]
         
+        # Read the current columns once instead of probing with failing ALTERs
+        existing = {row[1] for row in cursor.execute("PRAGMA table_info(modules)")}
+        if not existing:
+            print("ℹ️ No modules table yet - nothing to migrate")
+            return True
+        
+        missing = []
         for field_name, field_type in fields_to_add:
-            try:
-                sql = f"ALTER TABLE modules ADD COLUMN {field_name} {field_type}"
-                cursor.execute(sql)
+            if field_name in existing:
+                print(f"⚠️ Field already exists: {field_name}")
+            elif not field_name.isidentifier():
+                raise ValueError(f"Invalid column name: {field_name!r}")
+            else:
+                missing.append((field_name, field_type))
+        
+        # All ALTERs parsed and committed as one script - a single fsync for the batch
+        if missing:
+            ddl = ";\n".join(f"ALTER TABLE modules ADD COLUMN {name} {typ}" for name, typ in missing)
+            cursor.executescript(f"BEGIN;\n{ddl};\nCOMMIT;")
+            for field_name, _ in missing:
                 print(f"✅ Added field: {field_name}")
-            except sqlite3.OperationalError as e:
-                if "duplicate column name" in str(e).lower():
-                    print(f"⚠️ Field already exists: {field_name}")
-                else:
-                    raise
         
-        conn.commit()
-        conn.close()
+        # Backfill the denormalized counts for documents processed before they existed
+        if {"concepts_count", "examples_count"} & {name for name, _ in missing}:
+            cursor.executescript("""
+                BEGIN;
+                UPDATE modules SET
+                    concepts_count = CASE WHEN json_valid(extracted_concepts)
+                        THEN (SELECT COUNT(*) FROM json_each(extracted_concepts)) ELSE 0 END,
+                    examples_count = CASE WHEN json_valid(extracted_examples)
+                        THEN (SELECT COUNT(*) FROM json_each(extracted_examples)) ELSE 0 END
+                WHERE document_processed_at IS NOT NULL;
+                COMMIT;
+            """)
+            print("✅ Backfilled concept and example counts")
+        
+        # Partial index for the document overview - only rows with a processed document
+        cursor.execute(
+            "CREATE INDEX IF NOT EXISTS ix_module_has_doc ON modules (id) "
+            "WHERE document_processed_at IS NOT NULL"
+        )
         
         print("🎉 Database migration complete!")
         return True
         
     except Exception as e:
         print(f"❌ Migration failed: {e}")
+        if conn is not None and conn.in_transaction:
+            conn.rollback()
         return False
+    finally:
+        if own_conn and conn is not None:
+            conn.close()
 
 if __name__ == "__main__":
     success = add_document_fields()
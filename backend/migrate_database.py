@@ -4,27 +4,40 @@ Database Migration Script
 Adds role columns to existing database
 """
 
-import sqlite3
 import os
 from pathlib import Path
 
-def migrate_database():
-    """Add role columns to existing users table"""
+from migrate import connect
+
+def migrate_database(conn=None):
+    """
+    Add role columns to existing users table
+    Pass conn to run on a shared migration connection (see migrate.py)
+    """
     
+    own_conn = conn is None
     db_path = Path("harv_v2.db")
-    if not db_path.exists():
+    if own_conn and not db_path.exists():
         print("✅ No existing database found - will create fresh")
         return
     
     print("🗄️ Migrating existing database...")
     
-    conn = sqlite3.connect(db_path)
+    if own_conn:
+        conn = connect(db_path)
     cursor = conn.cursor()
     
     try:
+        # One explicit transaction: a single fsync for the whole batch
+        cursor.execute("BEGIN")
+        
         # Check if role column already exists
         cursor.execute("PRAGMA table_info(users)")
         columns = [column[1] for column in cursor.fetchall()]
+        if not columns:
+            print("  ℹ️ No users table yet - nothing to migrate")
+            conn.rollback()
+            return
         
         if 'role' not in columns:
             print("  ➕ Adding 'role' column...")
@@ -56,6 +69,11 @@ def migrate_database():
         else:
             print("  ✅ 'learning_profile' column already exists")
         
+        # Primary keys are indexed already - drop the duplicate ix_<table>_id left by index=True
+        for table in ("users", "onboarding_surveys", "modules", "conversations", "messages", "memory_summaries", "user_progress"):
+            cursor.execute(f"DROP INDEX IF EXISTS ix_{table}_id")
+        print("  ✅ Redundant primary key indexes removed")
+        
         conn.commit()
         print("  ✅ Database migration completed successfully")
         
@@ -63,7 +81,8 @@ def migrate_database():
         print(f"  ❌ Migration error: {e}")
         conn.rollback()
     finally:
-        conn.close()
+        if own_conn:
+            conn.close()
 
 if __name__ == "__main__":
     migrate_database()
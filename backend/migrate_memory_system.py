@@ -6,19 +6,26 @@ Ensures all required fields exist for 4-layer memory system
 
 import sys
 import os
+import functools
 sys.path.append(os.path.join(os.path.dirname(__file__), 'app'))
 
 from sqlalchemy import create_engine, text, inspect
 from sqlalchemy.orm import sessionmaker
+from sqlalchemy.pool import StaticPool
 from app.core.config import settings
 from app.core.database import Base
 from app.models import *  # Import all models
 
-def check_and_update_schema():
+@functools.cache
+def get_engine():
+    """Single engine shared by every migration step (one-shot script, one connection)"""
+    return create_engine(settings.database_url, pool_size=1)
+
+def check_and_update_schema(engine=None):
     """Check if database schema supports memory system"""
     print("🔍 Checking database schema for memory system compatibility...")
     
-    engine = create_engine(settings.database_url)
+    engine = engine or get_engine()
     inspector = inspect(engine)
     
     # Check if all required tables exist
@@ -39,11 +46,11 @@ def check_and_update_schema():
     
     return True
 
-def create_sample_data():
+def create_sample_data(engine=None):
     """Create sample data for testing memory system - FIXED"""
     print("\n📊 Creating sample data for memory system testing...")
     
-    engine = create_engine(settings.database_url)
+    engine = engine or get_engine()
     SessionLocal = sessionmaker(autocommit=False, autoflush=False, bind=engine)
     db = SessionLocal()
     
@@ -87,13 +94,23 @@ def create_sample_data():
     finally:
         db.close()
 
+def migrate(conn=None):
+    """
+    Run both memory system steps
+    Pass an open sqlite3 connection to reuse it instead of opening the configured database (see migrate.py)
+    """
+    engine = None
+    if conn is not None:
+        engine = create_engine("sqlite://", creator=lambda: conn, poolclass=StaticPool)
+    check_and_update_schema(engine)
+    create_sample_data(engine)
+
 if __name__ == "__main__":
     print("🚀 Starting Memory System Migration - FIXED")
     print("===========================================")
     
     try:
-        check_and_update_schema()
-        create_sample_data()
+        migrate()
         
         print("\n🎉 Memory System Migration Complete!")
         print("✅ Database schema is ready for 4-layer memory system")
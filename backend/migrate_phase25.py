@@ -4,25 +4,93 @@ Phase 2.5 Database Migration
 Adds tables and indexes for OpenAI integration and analytics
 """
 
-import sqlite3
+import sys
 from datetime import datetime
 import logging
 
-logging.basicConfig(level=logging.INFO)
+from migrate import connect
+
 logger = logging.getLogger(__name__)
 
-def run_phase25_migration():
-    """Run Phase 2.5 database migration"""
+PHASE25_COLUMNS = {
+    'conversation_history': [
+        ('openai_model', 'TEXT'),
+        ('token_usage', 'INTEGER DEFAULT 0'),
+        ('cost_estimate', 'REAL DEFAULT 0.0'),
+    ],
+    'memory_summaries': [
+        ('context_optimization_score', 'REAL DEFAULT 0.0'),
+        ('personalization_score', 'REAL DEFAULT 0.0'),
+    ],
+}
+
+def add_missing_columns(cursor, table, columns):
+    """Add only the columns PRAGMA table_info reports as missing"""
+    existing = {row[1] for row in cursor.execute(f'PRAGMA table_info({table})')}
+    if not existing:
+        logger.info(f"ℹ️ Table {table} not found - skipping Phase 2.5 fields")
+        return
+    
+    missing = [(name, ddl) for name, ddl in columns if name not in existing]
+    if not missing:
+        logger.info(f"ℹ️ Phase 2.5 fields already exist in {table}")
+        return
+    
+    for name, ddl in missing:
+        cursor.execute(f'ALTER TABLE {table} ADD COLUMN {name} {ddl}')
+    logger.info(f"✅ Added Phase 2.5 fields to {table}")
+
+PHASE25_INDEXES = [
+    ('idx_openai_usage_user_id', 'openai_usage', 'user_id'),
+    ('idx_openai_usage_created_at', 'openai_usage', 'created_at'),
+    ('idx_websocket_sessions_user_id', 'websocket_sessions', 'user_id'),
+    ('idx_learning_analytics_user_id', 'learning_analytics', 'user_id'),
+    ('idx_learning_analytics_date', 'learning_analytics', 'measurement_date'),
+]
+
+def create_phase25_indexes(cursor):
+    """Create the Phase 2.5 indexes on whichever of their tables exist"""
+    tables = {row[0] for row in cursor.execute("SELECT name FROM sqlite_master WHERE type='table'")}
+    for index_name, table, column in PHASE25_INDEXES:
+        if table in tables:
+            cursor.execute(f'CREATE INDEX IF NOT EXISTS {index_name} ON {table} ({column})')
+
+def finalize_indexes(db_path='harv_v2.db'):
+    """
+    Build the Phase 2.5 indexes after data has been loaded
+    One sorted index build instead of per-row B-tree updates during the load
+    """
+    conn = connect(db_path)
+    try:
+        cursor = conn.cursor()
+        cursor.execute('BEGIN')
+        create_phase25_indexes(cursor)
+        conn.commit()
+        logger.info("✅ Phase 2.5 indexes ready")
+    finally:
+        conn.close()
+
+def run_phase25_migration(defer_indexes=False, conn=None):
+    """
+    Run Phase 2.5 database migration
+    Pass defer_indexes=True when seeding data next, then call finalize_indexes()
+    Pass conn to run on a shared migration connection (see migrate.py)
+    """
     
+    own_conn = conn is None
     try:
         # Connect to database
-        conn = sqlite3.connect('harv_v2.db')
+        if own_conn:
+            conn = connect(create=True)
         cursor = conn.cursor()
         
         logger.info("🗄️ Starting Phase 2.5 database migration...")
         
-        # Add OpenAI integration tracking table
-        cursor.execute('''
+        # One explicit transaction; all tables go in as one batch
+        cursor.executescript('''
+            BEGIN;
+            
+            -- OpenAI integration tracking table
             CREATE TABLE IF NOT EXISTS openai_usage (
                 id INTEGER PRIMARY KEY AUTOINCREMENT,
                 user_id INTEGER,
@@ -36,11 +104,9 @@ def run_phase25_migration():
                 socratic_score REAL DEFAULT 0.0,
                 created_at TIMESTAMP DEFAULT CURRENT_TIMESTAMP,
                 FOREIGN KEY (user_id) REFERENCES users (id)
-            )
-        ''')
-        
-        # Add WebSocket session tracking
-        cursor.execute('''
+            );
+            
+            -- WebSocket session tracking
             CREATE TABLE IF NOT EXISTS websocket_sessions (
                 id INTEGER PRIMARY KEY AUTOINCREMENT,
                 session_id TEXT UNIQUE,
@@ -51,11 +117,9 @@ def run_phase25_migration():
                 message_count INTEGER DEFAULT 0,
                 duration_seconds INTEGER DEFAULT 0,
                 FOREIGN KEY (user_id) REFERENCES users (id)
-            )
-        ''')
-        
-        # Add analytics tracking table
-        cursor.execute('''
+            );
+            
+            -- Analytics tracking table
             CREATE TABLE IF NOT EXISTS learning_analytics (
                 id INTEGER PRIMARY KEY AUTOINCREMENT,
                 user_id INTEGER,
@@ -66,31 +130,16 @@ def run_phase25_migration():
                 measurement_date DATE,
                 created_at TIMESTAMP DEFAULT CURRENT_TIMESTAMP,
                 FOREIGN KEY (user_id) REFERENCES users (id)
-            )
+            );
         ''')
         
-        # Add indexes for performance
-        cursor.execute('CREATE INDEX IF NOT EXISTS idx_openai_usage_user_id ON openai_usage (user_id)')
-        cursor.execute('CREATE INDEX IF NOT EXISTS idx_openai_usage_created_at ON openai_usage (created_at)')
-        cursor.execute('CREATE INDEX IF NOT EXISTS idx_websocket_sessions_user_id ON websocket_sessions (user_id)')
-        cursor.execute('CREATE INDEX IF NOT EXISTS idx_learning_analytics_user_id ON learning_analytics (user_id)')
-        cursor.execute('CREATE INDEX IF NOT EXISTS idx_learning_analytics_date ON learning_analytics (measurement_date)')
-        
         # Update existing tables with Phase 2.5 fields
-        try:
-            cursor.execute('ALTER TABLE conversation_history ADD COLUMN openai_model TEXT')
-            cursor.execute('ALTER TABLE conversation_history ADD COLUMN token_usage INTEGER DEFAULT 0')
-            cursor.execute('ALTER TABLE conversation_history ADD COLUMN cost_estimate REAL DEFAULT 0.0')
-            logger.info("✅ Added Phase 2.5 fields to conversation_history")
-        except sqlite3.OperationalError:
-            logger.info("ℹ️ Phase 2.5 fields already exist in conversation_history")
+        add_missing_columns(cursor, 'conversation_history', PHASE25_COLUMNS['conversation_history'])
+        add_missing_columns(cursor, 'memory_summaries', PHASE25_COLUMNS['memory_summaries'])
         
-        try:
-            cursor.execute('ALTER TABLE memory_summaries ADD COLUMN context_optimization_score REAL DEFAULT 0.0')
-            cursor.execute('ALTER TABLE memory_summaries ADD COLUMN personalization_score REAL DEFAULT 0.0')
-            logger.info("✅ Added Phase 2.5 fields to memory_summaries")
-        except sqlite3.OperationalError:
-            logger.info("ℹ️ Phase 2.5 fields already exist in memory_summaries")
+        # Indexes for performance - skipped when a bulk load will follow
+        if not defer_indexes:
+            create_phase25_indexes(cursor)
         
         # Commit changes
         conn.commit()
@@ -102,15 +151,20 @@ def run_phase25_migration():
         tables = cursor.fetchall()
         logger.info(f"📊 Database now has {len(tables)} tables")
         
-        conn.close()
         return True
         
     except Exception as e:
         logger.error(f"❌ Migration failed: {str(e)}")
+        if conn is not None and conn.in_transaction:
+            conn.rollback()
         return False
+    finally:
+        if own_conn and conn is not None:
+            conn.close()
 
 if __name__ == "__main__":
-    success = run_phase25_migration()
+    logging.basicConfig(level=logging.INFO)
+    success = run_phase25_migration(defer_indexes="--defer-indexes" in sys.argv)
     if success:
         print("🎉 Phase 2.5 migration completed successfully!")
     else:
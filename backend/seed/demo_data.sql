@@ -0,0 +1,173 @@
+-- Harv v2.0 real demo data
+-- Loaded by create_real_demo_data.py in a single transaction.
+-- The dataset is static: 1 demo user, 5 modules, 3 conversations with 12 messages,
+-- 3 memory summaries and 5 progress records. Timestamps are relative to load time.
+-- Every statement skips rows that already exist, so the file is safe to reload.
+
+-- Read the clock once: every relative timestamp below is offset from this one local ISO string
+CREATE TEMP TABLE seed_clock AS SELECT datetime('now', 'localtime') AS now;
+
+-- Demo user (demo@harv.com / demo123, bcrypt cost 12)
+INSERT OR IGNORE INTO users (email, name, hashed_password, is_active, role)
+VALUES ('demo@harv.com', 'Demo User', '$2b$12$k6/39FISFRaec0CVl6vu4.n54l8nrcuCUh2oFZdB0/ifBd.dxGFN.', 1, 'student');
+
+INSERT INTO onboarding_surveys (user_id, learning_style, preferred_pace, background_info, goals,
+                                interaction_preference, motivation_level, time_availability)
+SELECT u.id, 'visual', 'moderate', 'Interested in communication theory and media studies',
+       'Learn about mass communication and media effects', 'questions', 'high', '1-2 hours per week'
+FROM users u
+WHERE u.email = 'demo@harv.com'
+  AND NOT EXISTS (SELECT 1 FROM onboarding_surveys s WHERE s.user_id = u.id);
+
+-- Learning modules with full Socratic configuration
+INSERT OR IGNORE INTO modules (id, title, description, system_prompt, module_prompt, learning_objectives,
+                              difficulty_level, estimated_duration, is_active, api_endpoint) VALUES
+    (1,
+     'Your Four Worlds',
+     'Communication models, perception, and the four worlds we live in: private, public, ideal, and real',
+     'Use Socratic questioning to guide students in discovering how perception shapes communication. Focus on helping them identify the four worlds: private (inner thoughts), public (shared reality), ideal (how things should be), and real (how things actually are). Never give direct answers - lead them to insights through strategic questions about their own experiences.',
+     'Help students understand how different perceptual worlds create different communication realities. Ask them to consider examples from their daily life where they''ve experienced these different worlds.',
+     'Students will discover how perception influences communication, identify the four worlds of human experience, and understand how miscommunication often occurs when people are operating from different perceptual worlds.',
+     'beginner',
+     45,
+     1,
+     'https://api.openai.com/v1/chat/completions'),
+    (2,
+     'Writing: The Persistence of Words',
+     'How writing technology transformed human communication and enabled the preservation of knowledge across time',
+     'Guide students to explore how writing technology revolutionized human communication. Use questions to help them discover the profound changes writing brought to society, memory, and knowledge transmission. Focus on the concept of ''persistence'' - how writing makes words permanent.',
+     'Focus on the revolutionary impact of written language on civilization. Help students understand how writing changed not just communication, but human consciousness itself.',
+     'Understand how writing technology changed human communication patterns, enabled complex societies, and transformed the way humans think and remember.',
+     'intermediate',
+     60,
+     1,
+     'https://api.openai.com/v1/chat/completions'),
+    (3,
+     'Books: Birth of Mass Communication',
+     'The printing press revolution and how books became the first mass medium',
+     'Help students discover how the printing press created the first mass communication medium. Use Socratic questioning to explore the social, cultural, and political impacts of mass-produced books. Guide them to understand how this technology democratized knowledge.',
+     'Explore the social and cultural impacts of mass-produced books. Focus on how the printing press changed who could access information and how ideas spread through society.',
+     'Students will analyze how the printing press enabled true mass communication, understand its role in social change, and connect it to modern mass media principles.',
+     'intermediate',
+     50,
+     1,
+     'https://api.openai.com/v1/chat/completions'),
+    (4,
+     'Mass Communication Theory',
+     'Understanding mass media effects, theories, and their application to modern media',
+     'Use questioning to guide students through major mass communication theories like agenda setting, cultivation theory, and uses and gratifications. Help them apply these theories to their own media consumption experiences.',
+     'Focus on how mass communication theories explain media effects on individuals and society. Help students become critical consumers of media by understanding these theoretical frameworks.',
+     'Master key mass communication theories, understand their applications to modern media, and develop critical thinking skills about media influence.',
+     'advanced',
+     75,
+     1,
+     'https://api.openai.com/v1/chat/completions'),
+    (5,
+     'Digital Revolution',
+     'How digital technology is fundamentally transforming human communication and society',
+     'Guide students to analyze the ongoing digital transformation of communication. Help them understand how digital media differs from traditional mass media and what implications this has for society, relationships, and democracy.',
+     'Explore how digital technology is reshaping human interaction, information flow, and social structures. Focus on both opportunities and challenges of the digital age.',
+     'Understand the revolutionary impact of digital communication technologies, analyze their effects on society and individuals, and critically evaluate digital media trends.',
+     'advanced',
+     60,
+     1,
+     'https://api.openai.com/v1/chat/completions');
+
+-- One conversation each for the first three modules
+WITH seed(module_id, title, age) AS (VALUES
+    (1, 'Exploring Your Four Worlds', '-0 days'),
+    (2, 'Exploring Writing: The Persistence of Words', '-1 days'),
+    (3, 'Exploring Books: Birth of Mass Communication', '-2 days')
+)
+INSERT INTO conversations (user_id, module_id, title, is_active, finalized, created_at)
+SELECT u.id, seed.module_id, seed.title, 1, 0, datetime(seed_clock.now, seed.age)
+FROM seed, seed_clock, users u
+WHERE u.email = 'demo@harv.com'
+  AND NOT EXISTS (SELECT 1 FROM conversations c WHERE c.user_id = u.id AND c.module_id = seed.module_id);
+
+-- Four-message Socratic exchange per conversation
+WITH seed(module_id, seq, role, content, token_count, response_time, age, shift) AS (VALUES
+    (1, 1, 'user',
+     'I''m curious about your four worlds. How does this relate to everyday communication?',
+     13, NULL, '-1 days', '-120 minutes'),
+    (1, 2, 'assistant',
+     'That''s an excellent question! Instead of me explaining it directly, let me ask you this: Can you think of a time recently when you experienced something related to your four worlds in your own life? What comes to mind?',
+     39, 120, '-1 days', '-125 minutes'),
+    (1, 3, 'user',
+     'I think I see what you mean. When I text my friends versus when I talk to my professor, I definitely communicate differently. Is that an example?',
+     27, NULL, '-1 days', '-90 minutes'),
+    (1, 4, 'assistant',
+     'Perfect observation! You''ve just identified a key principle. Now, what do you think drives those different communication choices? What''s different about those two contexts that makes you adjust your approach?',
+     30, 120, '-1 days', '-85 minutes'),
+    (2, 1, 'user',
+     'I''m curious about writing: the persistence of words. How does this relate to everyday communication?',
+     15, NULL, '-2 days', '-120 minutes'),
+    (2, 2, 'assistant',
+     'That''s an excellent question! Instead of me explaining it directly, let me ask you this: Can you think of a time recently when you experienced something related to writing: the persistence of words in your own life? What comes to mind?',
+     41, 120, '-2 days', '-125 minutes'),
+    (2, 3, 'user',
+     'I think I see what you mean. When I text my friends versus when I talk to my professor, I definitely communicate differently. Is that an example?',
+     27, NULL, '-2 days', '-90 minutes'),
+    (2, 4, 'assistant',
+     'Perfect observation! You''ve just identified a key principle. Now, what do you think drives those different communication choices? What''s different about those two contexts that makes you adjust your approach?',
+     30, 120, '-2 days', '-85 minutes'),
+    (3, 1, 'user',
+     'I''m curious about books: birth of mass communication. How does this relate to everyday communication?',
+     15, NULL, '-3 days', '-120 minutes'),
+    (3, 2, 'assistant',
+     'That''s an excellent question! Instead of me explaining it directly, let me ask you this: Can you think of a time recently when you experienced something related to books: birth of mass communication in your own life? What comes to mind?',
+     41, 120, '-3 days', '-125 minutes'),
+    (3, 3, 'user',
+     'I think I see what you mean. When I text my friends versus when I talk to my professor, I definitely communicate differently. Is that an example?',
+     27, NULL, '-3 days', '-90 minutes'),
+    (3, 4, 'assistant',
+     'Perfect observation! You''ve just identified a key principle. Now, what do you think drives those different communication choices? What''s different about those two contexts that makes you adjust your approach?',
+     30, 120, '-3 days', '-85 minutes')
+)
+INSERT INTO messages (conversation_id, role, content, token_count, response_time, created_at)
+SELECT c.id, seed.role, seed.content, seed.token_count, seed.response_time,
+       datetime(seed_clock.now, seed.age, seed.shift)
+FROM seed
+CROSS JOIN seed_clock
+JOIN users u ON u.email = 'demo@harv.com'
+JOIN conversations c ON c.user_id = u.id AND c.module_id = seed.module_id
+WHERE NOT EXISTS (SELECT 1 FROM messages m WHERE m.conversation_id = c.id)
+ORDER BY c.id, seed.seq;
+
+-- Memory summaries for the three studied modules
+WITH seed(module_id, title, confidence_level, retention_strength, age) AS (VALUES
+    (1, 'Your Four Worlds', 0.75, 0.85, '-1 days'),
+    (2, 'Writing: The Persistence of Words', 0.8, 0.88, '-2 days'),
+    (3, 'Books: Birth of Mass Communication', 0.85, 0.91, '-3 days')
+)
+INSERT INTO memory_summaries (user_id, module_id, what_learned, how_learned, connections_made,
+                              confidence_level, retention_strength, created_at)
+SELECT u.id, seed.module_id,
+       'Discovered key concepts in ' || seed.title || ' through guided questioning and reflection on personal communication experiences',
+       'Through Socratic dialogue that connected theoretical concepts to real-world examples from my daily life',
+       'Connected ' || seed.title || ' principles to my experience with social media, texting, and face-to-face communication',
+       seed.confidence_level, seed.retention_strength, datetime(seed_clock.now, seed.age)
+FROM seed, seed_clock, users u
+WHERE u.email = 'demo@harv.com'
+  AND NOT EXISTS (SELECT 1 FROM memory_summaries s WHERE s.user_id = u.id AND s.module_id = seed.module_id);
+
+-- Realistic varying progress - only the first three modules have been studied
+WITH seed(module_id, completion_percentage, mastery_level, total_conversations, total_messages,
+          time_spent, insights_gained, questions_asked, connections_made, age) AS (VALUES
+    (1, 25, 'beginner', 1, 4, 20, 2, 6, 1, '-0 days'),
+    (2, 40, 'beginner', 1, 4, 30, 3, 8, 2, '-1 days'),
+    (3, 55, 'intermediate', 1, 4, 40, 4, 10, 3, '-2 days'),
+    (4, 0, 'beginner', 0, 0, 0, 0, 0, 0, '-3 days'),
+    (5, 0, 'beginner', 0, 0, 0, 0, 0, 0, '-4 days')
+)
+INSERT INTO user_progress (user_id, module_id, completion_percentage, mastery_level, total_conversations,
+                           total_messages, time_spent, insights_gained, questions_asked, connections_made,
+                           is_completed, updated_at)
+SELECT u.id, seed.module_id, seed.completion_percentage, seed.mastery_level, seed.total_conversations,
+       seed.total_messages, seed.time_spent, seed.insights_gained, seed.questions_asked, seed.connections_made,
+       seed.completion_percentage >= 100, datetime(seed_clock.now, seed.age)
+FROM seed, seed_clock, users u
+WHERE u.email = 'demo@harv.com'
+  AND NOT EXISTS (SELECT 1 FROM user_progress p WHERE p.user_id = u.id AND p.module_id = seed.module_id);
+
+DROP TABLE seed_clock;
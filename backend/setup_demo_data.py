@@ -8,90 +8,117 @@ import sys
 import os
 sys.path.append(os.path.dirname(os.path.abspath(__file__)))
 
-from sqlalchemy.orm import Session
-from app.core.database import SessionLocal, create_tables
-from app.core.security import get_password_hash
+from sqlalchemy import insert, select
+from sqlalchemy.dialects import postgresql, sqlite
+from sqlalchemy.ext.asyncio import async_sessionmaker, create_async_engine
+from app.core.config import settings
+from app.core.database import create_tables
 
 # Import only what we need
 from app.models.user import User
 from app.models.course import Module
+from setup_demo_users import DEMO_USER_HASHES, require_non_production
+
+def async_database_url(url: str) -> str:
+    """Map the sync database URL onto its asyncio driver"""
+    return (
+        url.replace("sqlite://", "sqlite+aiosqlite://", 1)
+        .replace("postgresql://", "postgresql+asyncpg://", 1)
+    )
 
 async def setup_demo_data():
     """Setup basic demo data"""
     
+    require_non_production()
+    
     print("🚀 Setting up Harv v2.0 demo data...")
     
     create_tables()
-    db = SessionLocal()
+    async_engine = create_async_engine(async_database_url(settings.database_url))
+    AsyncSessionLocal = async_sessionmaker(async_engine, expire_on_commit=False)
+    
+    async with AsyncSessionLocal() as session:
+        try:
+            await _seed(session)
+        except Exception as e:
+            print(f"❌ Error: {e}")
+            await session.rollback()
+            raise
+        finally:
+            await async_engine.dispose()
+
+async def _seed(session):
+    """Insert the demo users and modules that are not there yet"""
+    
+    # Create demo users
+    users_data = [
+        {"email": "student@demo.com", "name": "Alex Student", "password": "student123", "role": "student"},
+        {"email": "teacher@demo.com", "name": "Dr. Sarah Educator", "password": "teacher123", "role": "educator"},
+        {"email": "admin@demo.com", "name": "System Administrator", "password": "admin123", "role": "admin"},
+        {"email": "demo@harv.com", "name": "Demo User (All Access)", "password": "demo123", "role": "universal"}
+    ]
+    
+    # Create basic modules
+    basic_modules = [
+        {"title": "Your Four Worlds", "description": "Communication models and perception"},
+        {"title": "Writing: Persistence of Words", "description": "How writing transformed communication"},
+        {"title": "Books: Mass Communication", "description": "The printing press revolution"},
+    ]
+    
+    # Titles carry no unique constraint, so modules still need the IN lookup
+    titles = [m["title"] for m in basic_modules]
+    result = await session.execute(select(Module.title).where(Module.title.in_(titles)))
+    existing_titles = set(result.scalars())
+    new_modules = [
+        {
+            "title": mod_data["title"],
+            "description": mod_data["description"],
+            "system_prompt": "Guide students through Socratic discovery of communication concepts.",
+            "module_prompt": "Help students explore through questioning.",
+            "learning_objectives": "Understand communication principles through discovery.",
+            "difficulty_level": "intermediate",
+            "estimated_duration": 45,
+            "is_active": True
+        }
+        for mod_data in basic_modules
+        if mod_data["title"] not in existing_titles
+    ]
+    
+    user_rows = [
+        {
+            "email": user_data["email"],
+            "name": user_data["name"],
+            "hashed_password": DEMO_USER_HASHES[user_data["email"]],
+            "role": user_data["role"],
+            "is_active": True
+        }
+        for user_data in users_data
+    ]
+    
+    # One INSERT ... ON CONFLICT DO NOTHING - existing accounts are skipped by the database
+    dialect_insert = postgresql.insert if session.bind.dialect.name == "postgresql" else sqlite.insert
+    result = await session.execute(
+        dialect_insert(User)
+        .values(user_rows)
+        .on_conflict_do_nothing(index_elements=["email"])
+        .returning(User.email)
+    )
+    created_users = len(result.scalars().all())
+    if new_modules:
+        await session.execute(insert(Module), new_modules)
+    await session.commit()
+    
+    print(f"✅ Created {created_users} demo users")
+    print(f"✅ Created {len(new_modules)} sample modules")
     
-    try:
-        # Create demo users
-        users_data = [
-            {"email": "student@demo.com", "name": "Alex Student", "password": "student123", "role": "student"},
-            {"email": "teacher@demo.com", "name": "Dr. Sarah Educator", "password": "teacher123", "role": "educator"},
-            {"email": "admin@demo.com", "name": "System Administrator", "password": "admin123", "role": "admin"},
-            {"email": "demo@harv.com", "name": "Demo User (All Access)", "password": "demo123", "role": "universal"}
-        ]
-        
-        created_users = 0
-        for user_data in users_data:
-            existing = db.query(User).filter(User.email == user_data["email"]).first()
-            if not existing:
-                user = User(
-                    email=user_data["email"],
-                    name=user_data["name"],
-                    hashed_password=get_password_hash(user_data["password"]),
-                    role=user_data["role"],
-                    is_active=True
-                )
-                db.add(user)
-                created_users += 1
-        
-        db.flush()
-        print(f"✅ Created {created_users} demo users")
-        
-        # Create basic modules
-        basic_modules = [
-            {"title": "Your Four Worlds", "description": "Communication models and perception"},
-            {"title": "Writing: Persistence of Words", "description": "How writing transformed communication"},
-            {"title": "Books: Mass Communication", "description": "The printing press revolution"},
-        ]
-        
-        created_modules = 0
-        for i, mod_data in enumerate(basic_modules, 1):
-            existing = db.query(Module).filter(Module.title == mod_data["title"]).first()
-            if not existing:
-                module = Module(
-                    title=mod_data["title"],
-                    description=mod_data["description"],
-                    system_prompt="Guide students through Socratic discovery of communication concepts.",
-                    module_prompt="Help students explore through questioning.",
-                    learning_objectives="Understand communication principles through discovery.",
-                    difficulty_level="intermediate",
-                    estimated_duration=45,
-                    is_active=True
-                )
-                db.add(module)
-                created_modules += 1
-        
-        db.commit()
-        print(f"✅ Created {created_modules} sample modules")
-        
-        print("\n🎉 DEMO SETUP COMPLETE!")
-        print("=" * 40)
-        print("Demo Accounts:")
-        print("  🎓 Student: student@demo.com / student123")
-        print("  🧑‍🏫 Teacher: teacher@demo.com / teacher123")
-        print("  ⚙️ Admin: admin@demo.com / admin123")
-        print("  🔄 Universal: demo@harv.com / demo123")
-        print("\nServer starting...")
-        
-    except Exception as e:
-        print(f"❌ Error: {e}")
-        db.rollback()
-        raise
-    finally:
-        db.close()
+    print("\n🎉 DEMO SETUP COMPLETE!")
+    print("=" * 40)
+    print("Demo Accounts:")
+    print("  🎓 Student: student@demo.com / student123")
+    print("  🧑‍🏫 Teacher: teacher@demo.com / teacher123")
+    print("  ⚙️ Admin: admin@demo.com / admin123")
+    print("  🔄 Universal: demo@harv.com / demo123")
+    print("\nServer starting...")
 
 if __name__ == "__main__":
     asyncio.run(setup_demo_data())
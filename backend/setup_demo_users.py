@@ -8,14 +8,31 @@ import sys
 import os
 sys.path.append(os.path.dirname(os.path.abspath(__file__)))
 
+from sqlalchemy.dialects import postgresql, sqlite
 from sqlalchemy.orm import Session
+from app.core.config import settings
 from app.core.database import SessionLocal, create_tables
-from app.core.security import get_password_hash
 from app.models.user import User
 
+# bcrypt (cost 12) hashes of the published demo passwords, computed once offline so
+# seeding does no hashing at runtime - never valid for a production deployment
+DEMO_USER_HASHES = {
+    "student@demo.com": "$2b$12$CtSrifkDeQVDzsSdtrLkGeSzA8K4ukN.t3CHv9ujXzn6.ruUub436",  # student123
+    "teacher@demo.com": "$2b$12$KIdEOGkoU4xJ4wGGKaU6MetqpQe7LFDU9ROhw17XSDDfBcPHLe3B.",  # teacher123
+    "admin@demo.com": "$2b$12$QBii1OGbmU6I7DaYprZkquNZ88AI9dNFBoQvu7yLvmtQTEa/NTh1a",  # admin123
+    "demo@harv.com": "$2b$12$0XIC1PT7TfrSDvjEBD7RCe5L97xphdj/mxwPR/6urlMF2DWFMQzFa",  # demo123
+}
+
+def require_non_production():
+    """Refuse to seed the precomputed demo credentials into production"""
+    if settings.environment.lower() == "production":
+        raise RuntimeError("❌ Demo users must not be seeded with ENVIRONMENT=production")
+
 def setup_demo_users():
     """Setup demo users only"""
     
+    require_non_production()
+    
     print("🚀 Setting up Harv v2.0 demo users...")
     print("=====================================")
     
@@ -54,29 +71,33 @@ def setup_demo_users():
             }
         ]
         
-        created_count = 0
+        rows = [
+            {
+                "email": user_data["email"],
+                "name": user_data["name"],
+                "hashed_password": DEMO_USER_HASHES[user_data["email"]],
+                "role": user_data["role"],
+                "is_active": True
+            }
+            for user_data in users_data
+        ]
+        
+        # One INSERT ... ON CONFLICT DO NOTHING - existing accounts are skipped by the database
+        dialect_insert = postgresql.insert if db.bind.dialect.name == "postgresql" else sqlite.insert
+        stmt = (
+            dialect_insert(User)
+            .values(rows)
+            .on_conflict_do_nothing(index_elements=["email"])
+            .returning(User.email)
+        )
+        created = set(db.execute(stmt).scalars())
+        
         for user_data in users_data:
-            # Check if user already exists
-            existing = db.query(User).filter(User.email == user_data["email"]).first()
-            if not existing:
-                # Create new user
-                user = User(
-                    email=user_data["email"],
-                    name=user_data["name"],
-                    hashed_password=get_password_hash(user_data["password"]),
-                    is_active=True
-                )
-                
-                # Add role if User model supports it
-                if hasattr(user, 'role'):
-                    user.role = user_data["role"]
-                
-                db.add(user)
-                created_count += 1
+            if user_data["email"] in created:
                 print(f"✅ Created user: {user_data['email']}")
             else:
                 print(f"✅ User exists: {user_data['email']}")
-        
+        created_count = len(created)
         db.commit()
         
         print(f"\n🎉 DEMO USERS READY! ({created_count} created)")
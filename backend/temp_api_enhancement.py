@@ -5,22 +5,86 @@ Add these endpoints to your existing backend/app/api/v1/endpoints/memory.py
 These endpoints work with ALL 15 modules for document upload and management
 """
 
-from fastapi import File, UploadFile, HTTPException, Form
-from typing import Optional, List
+from fastapi import File, UploadFile, HTTPException, Form, Response
+from typing import List
 import os
+import shutil
+import uuid
+from functools import lru_cache
 from pathlib import Path
 from datetime import datetime
+import anyio
+import anyio.to_thread
+import orjson
+from sqlalchemy import select, func, null, false, literal, union_all
 
 from app.services.document_processor import UniversalDocumentProcessor
+from app.models.course import document_status_json, has_document_clause, questions_available_clause
 from app.core.config import settings
 
+@lru_cache(maxsize=1)
+def get_processor() -> UniversalDocumentProcessor:
+    """Shared document processor - one OpenAI client for the whole process"""
+    return UniversalDocumentProcessor(settings.openai_api_key)
+
+# Accepted document types, checked by extension - clients send all sorts of Content-Type for Office files
+SUPPORTED_EXTS = frozenset({".pdf", ".docx", ".pptx", ".txt"})
+
+def validate_upload(file: UploadFile) -> str:
+    """Reject unsupported uploads before anything is written to disk; returns the extension"""
+    file_extension = Path(file.filename).suffix.lower()
+    if file_extension not in SUPPORTED_EXTS:
+        raise HTTPException(
+            status_code=400, 
+            detail=f"Unsupported file type: {file_extension}. Supported: {', '.join(sorted(SUPPORTED_EXTS))}"
+        )
+    return file_extension
+
+# Uploads are copied to disk in 1 MiB pieces so a large PDF never sits whole in memory
+UPLOAD_CHUNK_SIZE = 1 << 20
+
+# Cap on uploads being written to disk at once across the process
+DISK_WRITERS = 4
+
+@lru_cache(maxsize=1)
+def _disk_write_limiter() -> anyio.CapacityLimiter:
+    """Limiter for disk writers (created lazily - it needs a running event loop)"""
+    return anyio.CapacityLimiter(DISK_WRITERS)
+
+def _copy_upload(source, file_path: str) -> None:
+    """Blocking chunked copy of the spooled upload to its final path"""
+    with open(file_path, "wb") as out:
+        shutil.copyfileobj(source, out, UPLOAD_CHUNK_SIZE)
+
+async def save_upload(file: UploadFile, file_path: str) -> None:
+    """Stream an uploaded file to disk in a worker thread, off the event loop"""
+    await anyio.to_thread.run_sync(_copy_upload, file.file, file_path, limiter=_disk_write_limiter())
+
+# Module upload directories already created by this process
+_ENSURED = set()
+
+def ensure_upload_dir(module_id: int) -> str:
+    """Return the module's upload directory, creating it at most once per process"""
+    upload_dir = f"uploads/modules/module_{module_id}"
+    if module_id not in _ENSURED:
+        os.makedirs(upload_dir, exist_ok=True)
+        _ENSURED.add(module_id)
+    return upload_dir
+
 # ADD THESE ENDPOINTS TO YOUR EXISTING MEMORY ROUTER:
 
+@router.on_event("startup")
+async def create_upload_dirs():
+    """Pre-create the upload directories for all 15 modules"""
+    for module_id in range(1, 16):
+        ensure_upload_dir(module_id)
+
 @router.post("/modules/{module_id}/upload-document")
 async def upload_document_to_module(
     module_id: int,
     file: UploadFile = File(...),
-    db: Session = Depends(get_db)
+    db: Session = Depends(get_db),
+    processor: UniversalDocumentProcessor = Depends(get_processor)
 ):
     """
     Upload document to enhance ANY module (1-15) with intelligence
@@ -35,34 +99,22 @@ async def upload_document_to_module(
         if not (1 <= module_id <= 15):
             raise HTTPException(status_code=400, detail="Module ID must be between 1 and 15")
             
-        module = db.query(Module).filter(Module.id == module_id).first()
+        module = db.get(Module, module_id)
         if not module:
             raise HTTPException(status_code=404, detail=f"Module {module_id} not found")
         
         # Validate file type
-        processor = UniversalDocumentProcessor(settings.openai_api_key)
-        supported_types = processor.get_supported_file_types()
-        file_extension = Path(file.filename).suffix.lower()
-        
-        if file_extension not in supported_types:
-            raise HTTPException(
-                status_code=400, 
-                detail=f"Unsupported file type: {file_extension}. Supported: {', '.join(supported_types)}"
-            )
+        file_extension = validate_upload(file)
         
-        # Create upload directory
-        upload_dir = f"uploads/modules/module_{module_id}"
-        os.makedirs(upload_dir, exist_ok=True)
+        # Upload directory (created at startup)
+        upload_dir = ensure_upload_dir(module_id)
         
-        # Save uploaded file with unique name
-        timestamp = datetime.now().strftime("%Y%m%d_%H%M%S")
-        safe_filename = f"{timestamp}_{file.filename}"
+        # Save uploaded file with unique name (original filename is kept in source_document_name)
+        safe_filename = f"{uuid.uuid4().hex}{file_extension}"
         file_path = os.path.join(upload_dir, safe_filename)
         
         # Save file
-        with open(file_path, "wb") as buffer:
-            content = await file.read()
-            buffer.write(content)
+        await save_upload(file, file_path)
         
         # Process document with AI
         result = await processor.process_document_for_module(
@@ -113,23 +165,15 @@ async def get_module_document_status(
     if not (1 <= module_id <= 15):
         raise HTTPException(status_code=400, detail="Module ID must be between 1 and 15")
     
-    module = db.query(Module).filter(Module.id == module_id).first()
-    if not module:
-        raise HTTPException(status_code=404, detail=f"Module {module_id} not found")
-    
     try:
-        status = module.get_document_status() if hasattr(module, 'get_document_status') else {
-            "has_document": False,
-            "message": "Document intelligence not available"
-        }
-        
-        return {
-            "module_id": module_id,
-            "module_title": module.title,
-            **status
-        }
+        # Payload is assembled by the database (see document_status_json in the Module enhancement)
+        status_json = document_status_json(db, module_id)
     except Exception as e:
         raise HTTPException(status_code=500, detail=f"Failed to get status: {str(e)}")
+    
+    if status_json is None:
+        raise HTTPException(status_code=404, detail=f"Module {module_id} not found")
+    return Response(content=status_json, media_type="application/json")
 
 
 @router.delete("/modules/{module_id}/document")
@@ -142,7 +186,7 @@ async def remove_module_document(
     if not (1 <= module_id <= 15):
         raise HTTPException(status_code=400, detail="Module ID must be between 1 and 15")
     
-    module = db.query(Module).filter(Module.id == module_id).first()
+    module = db.get(Module, module_id)
     if not module:
         raise HTTPException(status_code=404, detail=f"Module {module_id} not found")
     
@@ -180,7 +224,8 @@ async def remove_module_document(
 async def bulk_upload_documents(
     files: List[UploadFile] = File(...),
     module_ids: str = Form(...),  # Comma-separated module IDs
-    db: Session = Depends(get_db)
+    db: Session = Depends(get_db),
+    processor: UniversalDocumentProcessor = Depends(get_processor)
 ):
     """
     Upload multiple documents to multiple modules
@@ -205,22 +250,15 @@ async def bulk_upload_documents(
             if not (1 <= mid <= 15):
                 raise HTTPException(status_code=400, detail=f"Module ID {mid} must be between 1 and 15")
         
-        processor = UniversalDocumentProcessor(settings.openai_api_key)
-        results = []
-        
-        # Process each file-module pair
-        for file, module_id in zip(files, module_id_list):
-            # Save file
-            upload_dir = f"uploads/modules/module_{module_id}"
-            os.makedirs(upload_dir, exist_ok=True)
+        async def _handle_one(file: UploadFile, module_id: int) -> dict:
+            """Save and process one file-module pair"""
+            file_extension = validate_upload(file)
+            upload_dir = ensure_upload_dir(module_id)
             
-            timestamp = datetime.now().strftime("%Y%m%d_%H%M%S")
-            safe_filename = f"{timestamp}_{file.filename}"
+            safe_filename = f"{uuid.uuid4().hex}{file_extension}"
             file_path = os.path.join(upload_dir, safe_filename)
             
-            with open(file_path, "wb") as buffer:
-                content = await file.read()
-                buffer.write(content)
+            await save_upload(file, file_path)
             
             # Process with AI
             result = await processor.process_document_for_module(
@@ -230,13 +268,28 @@ async def bulk_upload_documents(
                 original_filename=file.filename
             )
             
-            results.append({
+            return {
                 "module_id": module_id,
                 "filename": file.filename,
                 "success": result["success"],
                 "error": result.get("error"),
                 "processing_details": result.get("processing_details", {})
-            })
+            }
+        
+        # One pair at a time: the processor's OpenAI client is synchronous and every
+        # pair commits on the shared request session, so overlapping them gains nothing
+        results = []
+        for file, module_id in zip(files, module_id_list):
+            try:
+                results.append(await _handle_one(file, module_id))
+            except Exception as e:
+                results.append({
+                    "module_id": module_id,
+                    "filename": file.filename,
+                    "success": False,
+                    "error": str(e),
+                    "processing_details": {}
+                })
         
         successful_uploads = sum(1 for r in results if r["success"])
         
@@ -257,7 +310,34 @@ async def bulk_upload_documents(
 async def get_all_modules_document_status(db: Session = Depends(get_db)):
     """Get document intelligence status for all 15 modules"""
     
-    modules = db.query(Module).filter(Module.id.between(1, 15)).all()
+    # Counts and flags come straight from SQL - no Module objects, no JSON parsing in Python
+    # Only rows in the partial ix_module_has_doc index read document columns; the rest return id and title
+    dialect = db.bind.dialect.name
+    has_document = has_document_clause(dialect)
+    in_range = Module.id.between(1, 15)
+    with_documents = select(
+        Module.id,
+        Module.title,
+        Module.source_document_name,
+        Module.source_document_type,
+        Module.document_processed_at,
+        func.coalesce(Module.concepts_count, 0).label("concepts_count"),
+        func.coalesce(Module.examples_count, 0).label("examples_count"),
+        questions_available_clause(dialect).label("questions_available"),
+        has_document.label("has_document")
+    ).where(Module.document_processed_at.isnot(None), in_range)
+    without_documents = select(
+        Module.id,
+        Module.title,
+        null(),
+        null(),
+        null(),
+        literal(0),
+        literal(0),
+        false(),
+        false()
+    ).where(Module.document_processed_at.is_(None), in_range)
+    stmt = union_all(with_documents, without_documents).order_by("id")
     
     overview = {
         "total_modules": 15,
@@ -266,27 +346,30 @@ async def get_all_modules_document_status(db: Session = Depends(get_db)):
         "module_details": []
     }
     
-    for module in modules:
-        if hasattr(module, 'get_document_status'):
-            status = module.get_document_status()
-            has_doc = status.get("has_document", False)
-        else:
-            has_doc = False
-            status = {"has_document": False}
-        
+    for row in db.execute(stmt):
+        has_doc = bool(row.has_document)
         if has_doc:
             overview["modules_with_documents"] += 1
         else:
             overview["modules_without_documents"] += 1
         
         overview["module_details"].append({
-            "module_id": module.id,
-            "title": module.title,
+            "module_id": row.id,
+            "title": row.title,
             "has_document": has_doc,
-            **status
+            "document_name": row.source_document_name,
+            "document_type": row.source_document_type,
+            "processed_at": row.document_processed_at,
+            "concepts_count": row.concepts_count,
+            "examples_count": row.examples_count,
+            "questions_available": bool(row.questions_available)
         })
     
-    return overview
+    # orjson formats naive datetimes exactly like isoformat() - same as the single-module status
+    return Response(
+        content=orjson.dumps(overview),
+        media_type="application/json"
+    )
 
 # Usage examples for testing:
 # 
@@ -7,13 +7,37 @@ This enhancement works with ANY module (1-15) that has uploaded documents
 
 import json
 import logging
-from typing import Dict, Any, List
+from itertools import islice
+from typing import Dict, Any, List, Optional, Tuple
 
 logger = logging.getLogger(__name__)
 
+# REPLACE YOUR EXISTING EnhancedMemoryService.__init__ WITH:
+
+def __init__(self, db: Session):
+    self.db = db
+    # Per-request progress cache keyed by (user_id, module_id) - filled by preload_user_progress()
+    self._progress_by_module: Dict[Tuple[int, int], Optional[UserProgress]] = {}
+
 # ADD TO YOUR EXISTING EnhancedMemoryService class:
 
-async def _inject_module_data(self, module: Module) -> Dict[str, Any]:
+def preload_user_progress(self, user_id: int, module_ids: List[int]) -> None:
+    """Load the user's progress for every module this request touches in one query"""
+    rows = self.db.query(UserProgress).filter(
+        UserProgress.user_id == user_id,
+        UserProgress.module_id.in_(module_ids)
+    ).all()
+    # Modules without a row are cached as None so they don't fall back to a query
+    self._progress_by_module.update(dict.fromkeys((user_id, module_id) for module_id in module_ids))
+    self._progress_by_module.update({(user_id, row.module_id): row for row in rows})
+
+async def inject_modules_data(self, user_id: int, modules: List[Module]) -> Dict[int, Dict[str, Any]]:
+    """Request entry point - one progress query for all modules, then Layer 2 data per module"""
+    self.preload_user_progress(user_id, [module.id for module in modules])
+    return {module.id: await self._inject_module_data(module, user_id) for module in modules}
+
+
+async def _inject_module_data(self, module: Module, user_id: int) -> Dict[str, Any]:
     """
     Layer 2: Module Data Injection - UNIVERSALLY ENHANCED with document intelligence
     
@@ -22,10 +46,16 @@ async def _inject_module_data(self, module: Module) -> Dict[str, Any]:
     """
     
     try:
-        # YOUR EXISTING CODE (unchanged) - Get user progress
-        user_progress = self.db.query(UserProgress).filter(
-            UserProgress.module_id == module.id
-        ).first()
+        # Get user progress - preloaded per request by inject_modules_data()
+        key = (user_id, module.id)
+        if key in self._progress_by_module:
+            user_progress = self._progress_by_module[key]
+        else:
+            user_progress = self.db.query(UserProgress).filter(
+                UserProgress.user_id == user_id,
+                UserProgress.module_id == module.id
+            ).first()
+            self._progress_by_module[key] = user_progress
         
         # YOUR EXISTING TEACHING CONFIGURATION (preserved)
         teaching_config = {
@@ -65,20 +95,22 @@ async def _inject_module_data(self, module: Module) -> Dict[str, Any]:
                 }
                 
                 # ENHANCE Socratic strategy with document-specific guidance
-                enhanced_socratic_strategy = await self._generate_socratic_strategy(module)
+                strategy_parts = [await self._generate_socratic_strategy(module)]
                 
                 # Add document-specific teaching guidance
                 if document_examples:
-                    example_names = list(document_examples.keys())[:3]
-                    enhanced_socratic_strategy += f"\n\nDOCUMENT-SPECIFIC TEACHING GUIDANCE:"
-                    enhanced_socratic_strategy += f"\n- Reference these real examples from course materials: {', '.join(example_names)}"
+                    example_names = list(islice(document_examples, 3))
+                    strategy_parts.append("\n\nDOCUMENT-SPECIFIC TEACHING GUIDANCE:")
+                    strategy_parts.append(f"\n- Reference these real examples from course materials: {', '.join(example_names)}")
                     
                 if socratic_questions.get('concept_questions'):
-                    enhanced_socratic_strategy += f"\n- Use these targeted questions: {socratic_questions['concept_questions'][:2]}"
+                    strategy_parts.append(f"\n- Use these targeted questions: {list(islice(socratic_questions['concept_questions'], 2))}")
                 
                 if document_concepts:
-                    concept_names = list(document_concepts.keys())[:3]
-                    enhanced_socratic_strategy += f"\n- Focus on these key concepts: {', '.join(concept_names)}"
+                    concept_names = list(islice(document_concepts, 3))
+                    strategy_parts.append(f"\n- Focus on these key concepts: {', '.join(concept_names)}")
+                
+                enhanced_socratic_strategy = "".join(strategy_parts)
                 
                 logger.info(f"📚 Module {module.id} ({module.title}) enhanced with document intelligence")
                 logger.info(f"   - {len(document_concepts)} concepts, {len(document_examples)} examples")
@@ -135,3 +167,4 @@ def get_module_document_status(self, module_id: int) -> Dict[str, Any]:
 # Usage example:
 # status = memory_service.get_module_document_status(5)
 # print(f"Module 5 has document: {status.get('has_document')}")
+# layer2_by_module = await memory_service.inject_modules_data(user_id, modules)
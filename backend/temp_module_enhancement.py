@@ -3,11 +3,14 @@ UNIVERSAL MODULE ENHANCEMENT
 Add this code to your existing backend/app/models/course.py Module class
 """
 
-import json
-from sqlalchemy import Column, String, Text, DateTime
+from sqlalchemy import Column, String, Text, DateTime, JSON, Index
+from sqlalchemy.dialects.postgresql import JSONB
 from datetime import datetime
 from typing import Optional, Dict, List
 
+# Parsed by the driver (JSONB on Postgres, JSON text on SQLite) - assign dicts, not json.dumps strings
+DocumentJSON = JSON(none_as_null=True).with_variant(JSONB(none_as_null=True), "postgresql")
+
 class Module(Base, TimestampMixin):
     """
     Enhanced Module class with UNIVERSAL document intelligence
@@ -16,14 +19,17 @@ class Module(Base, TimestampMixin):
     
     # ... ALL YOUR EXISTING FIELDS REMAIN UNCHANGED ...
     
+    # ADD this entry to your EXISTING __table_args__ tuple (keep ix_module_has_doc) - same name as the alembic revision:
+    #     Index("ix_modules_concepts_gin", "extracted_concepts", postgresql_using="gin").ddl_if(dialect="postgresql"),
+    
     # NEW: Universal document intelligence fields (all optional)
     source_document_path = Column(String, nullable=True, comment="Path to uploaded document")
     source_document_name = Column(String, nullable=True, comment="Original filename")
     source_document_type = Column(String, nullable=True, comment="pdf, docx, pptx, txt")
     document_processed_at = Column(DateTime, nullable=True, comment="When AI processed document")
-    extracted_concepts = Column(Text, nullable=True, comment="AI-extracted concepts (JSON)")
-    extracted_examples = Column(Text, nullable=True, comment="Real-world examples (JSON)")
-    socratic_questions = Column(Text, nullable=True, comment="Generated questions (JSON)")
+    extracted_concepts = Column(DocumentJSON, nullable=True, comment="AI-extracted concepts (JSON)")
+    extracted_examples = Column(DocumentJSON, nullable=True, comment="Real-world examples (JSON)")
+    socratic_questions = Column(DocumentJSON, nullable=True, comment="Generated questions (JSON)")
     document_summary = Column(Text, nullable=True, comment="AI-generated summary")
     
     def has_document_intelligence(self) -> bool:
@@ -36,30 +42,15 @@ class Module(Base, TimestampMixin):
     
     def get_document_concepts(self) -> Dict[str, str]:
         """Get extracted concepts as dictionary"""
-        if not self.extracted_concepts:
-            return {}
-        try:
-            return json.loads(self.extracted_concepts)
-        except (json.JSONDecodeError, TypeError):
-            return {}
+        return self.extracted_concepts or {}
     
     def get_document_examples(self) -> Dict[str, str]:
         """Get extracted examples as dictionary"""
-        if not self.extracted_examples:
-            return {}
-        try:
-            return json.loads(self.extracted_examples)
-        except (json.JSONDecodeError, TypeError):
-            return {}
+        return self.extracted_examples or {}
     
     def get_socratic_questions(self) -> Dict[str, List[str]]:
         """Get generated Socratic questions as dictionary"""
-        if not self.socratic_questions:
-            return {"concept_questions": [], "application_questions": []}
-        try:
-            return json.loads(self.socratic_questions)
-        except (json.JSONDecodeError, TypeError):
-            return {"concept_questions": [], "application_questions": []}
+        return self.socratic_questions or {"concept_questions": [], "application_questions": []}
     
     def get_document_status(self) -> Dict[str, any]:
         """Get complete document intelligence status"""
@@ -67,7 +58,7 @@ class Module(Base, TimestampMixin):
             "has_document": self.has_document_intelligence(),
             "document_name": self.source_document_name,
             "document_type": self.source_document_type,
-            "processed_at": self.document_processed_at.isoformat() if self.document_processed_at else None,
+            "processed_at": self.document_processed_at,  # datetime - the response serializer formats it
             "concepts_count": len(self.get_document_concepts()),
             "examples_count": len(self.get_document_examples()),
             "questions_available": bool(self.socratic_questions)
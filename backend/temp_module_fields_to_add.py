@@ -5,24 +5,57 @@ Find your existing Module class and add these imports at the top:
 """
 
 # Add these imports to the TOP of your course.py file:
-from sqlalchemy import Column, Integer, String, Text, Boolean, DateTime  # Add DateTime
+from sqlalchemy import Column, String, Text, DateTime, JSON, Index  # Add DateTime, JSON, Index
 from typing import Dict, List  # Add these
-from datetime import datetime  # Add this
-import json  # Add this
+from sqlalchemy.dialects.postgresql import JSONB  # Add this
+import msgspec  # Add this
+
+# Parsed by the driver (binary JSONB on Postgres, JSON text on SQLite) - assign dicts, not json.dumps strings
+DocumentJSON = JSON(none_as_null=True).with_variant(JSONB(none_as_null=True), "postgresql")
+
+# Typed decoders built once at import - only needed for rows still holding JSON text
+# (written with json.dumps before the columns became JSON); malformed or mistyped text falls back to the default
+_CONCEPTS_DEC = msgspec.json.Decoder(Dict[str, str])
+_EXAMPLES_DEC = msgspec.json.Decoder(Dict[str, str])
+_QUESTIONS_DEC = msgspec.json.Decoder(Dict[str, List[str]])
+
+# Counting legacy text only needs the keys - values stay unparsed msgspec.Raw slices
+_COUNT_DEC = msgspec.json.Decoder(Dict[str, msgspec.Raw])
+
+def _entry_count(value) -> int:
+    """len() of a document JSON value without materializing legacy JSON text"""
+    if isinstance(value, (str, bytes)):
+        try:
+            return len(_COUNT_DEC.decode(value))
+        except (msgspec.ValidationError, msgspec.DecodeError):
+            return 0
+    return len(value or {})
+
+def _document_value(value, decoder: msgspec.json.Decoder, default):
+    """Driver-parsed value as-is, legacy JSON text through the column's typed decoder"""
+    if isinstance(value, (str, bytes)):
+        try:
+            value = decoder.decode(value)
+        except (msgspec.ValidationError, msgspec.DecodeError):
+            return default
+    return value or default
 
 # Then add these fields to your existing Module class:
 class Module(Base, TimestampMixin):
     # ... ALL YOUR EXISTING FIELDS ...
     
+    # ADD this entry to your EXISTING __table_args__ tuple (keep ix_module_has_doc) - same name as the alembic revision:
+    #     Index("ix_modules_concepts_gin", "extracted_concepts", postgresql_using="gin").ddl_if(dialect="postgresql"),
+    
     # NEW: Add these fields at the end of your existing fields
     source_document_path = Column(String, nullable=True)
     source_document_name = Column(String, nullable=True)
     source_document_type = Column(String, nullable=True)
     document_processed_at = Column(DateTime, nullable=True)
-    extracted_concepts = Column(Text, nullable=True)
-    extracted_examples = Column(Text, nullable=True)
-    socratic_questions = Column(Text, nullable=True)
-    document_summary = Column(Text, nullable=True)
+    extracted_concepts = Column(DocumentJSON, nullable=True)
+    extracted_examples = Column(DocumentJSON, nullable=True)
+    socratic_questions = Column(DocumentJSON, nullable=True)
+    document_summary = Column(Text, nullable=True)  # Prose, not JSON
     
     # NEW: Add these methods at the end of your Module class
     def has_document_intelligence(self) -> bool:
@@ -31,30 +64,17 @@ class Module(Base, TimestampMixin):
     
     def get_document_concepts(self) -> Dict[str, str]:
         """Get extracted concepts as dictionary"""
-        if not self.extracted_concepts:
-            return {}
-        try:
-            return json.loads(self.extracted_concepts)
-        except (json.JSONDecodeError, TypeError):
-            return {}
+        return _document_value(self.extracted_concepts, _CONCEPTS_DEC, {})
     
     def get_document_examples(self) -> Dict[str, str]:
         """Get extracted examples as dictionary"""
-        if not self.extracted_examples:
-            return {}
-        try:
-            return json.loads(self.extracted_examples)
-        except (json.JSONDecodeError, TypeError):
-            return {}
+        return _document_value(self.extracted_examples, _EXAMPLES_DEC, {})
     
     def get_socratic_questions(self) -> Dict[str, List[str]]:
         """Get generated Socratic questions as dictionary"""
-        if not self.socratic_questions:
-            return {"concept_questions": [], "application_questions": []}
-        try:
-            return json.loads(self.socratic_questions)
-        except (json.JSONDecodeError, TypeError):
-            return {"concept_questions": [], "application_questions": []}
+        return _document_value(
+            self.socratic_questions, _QUESTIONS_DEC, {"concept_questions": [], "application_questions": []}
+        )
     
     def get_document_status(self) -> Dict[str, any]:
         """Get complete document intelligence status"""
@@ -62,10 +82,12 @@ class Module(Base, TimestampMixin):
             "has_document": self.has_document_intelligence(),
             "document_name": self.source_document_name,
             "document_type": self.source_document_type,
-            "processed_at": self.document_processed_at.isoformat() if self.document_processed_at else None,
-            "concepts_count": len(self.get_document_concepts()),
-            "examples_count": len(self.get_document_examples()),
+            "processed_at": self.document_processed_at,  # datetime - the response serializer formats it
+            "concepts_count": _entry_count(self.extracted_concepts),
+            "examples_count": _entry_count(self.extracted_examples),
             "questions_available": bool(self.socratic_questions)
         }
 
+# document_status_json() and its SQL helpers live in app/models/course.py next to the live Module
+
 # MANUAL STEP: You need to manually add these to your actual course.py file
@@ -48,14 +48,13 @@ class TestOpenAIIntegration:
             assert response.socratic_analysis.question_count > 0
             assert response.token_usage.total_tokens == 150
     
-    @pytest.mark.asyncio
-    async def test_socratic_compliance_analysis(self, openai_service):
+    def test_socratic_compliance_analysis(self, openai_service):
         """Test Socratic methodology compliance analysis"""
         
         # Test high compliance response
         high_compliance_response = "What do you think makes communication effective? How might you apply this in your daily interactions? Can you think of examples?"
         
-        analysis = await openai_service._analyze_socratic_compliance(
+        analysis = openai_service._analyze_socratic_compliance(
             high_compliance_response, "How to communicate better?"
         )
         
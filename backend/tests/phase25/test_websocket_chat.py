@@ -5,41 +5,52 @@ Tests for real-time chat functionality
 
 import pytest
 import asyncio
+import json
 from unittest.mock import Mock, AsyncMock
 from fastapi.testclient import TestClient
 from app.main import app
 
+@pytest.fixture(scope="session")
+def client():
+    """One TestClient - and one app startup/shutdown - for every WebSocket test"""
+    with TestClient(app) as test_client:
+        yield test_client
+
+def receive_events(websocket):
+    """Next message as a list of events - the generated handler sends binary batch frames"""
+    message = websocket.receive()
+    payload = json.loads(message.get("text") or message["bytes"])
+    return payload["messages"] if payload.get("type") == "batch" else [payload]
+
 class TestWebSocketChat:
     """Test WebSocket chat functionality"""
     
-    def test_websocket_connection(self):
+    def test_websocket_connection(self, client):
         """Test WebSocket connection establishment"""
         
-        with TestClient(app) as client:
-            with client.websocket_connect("/api/v1/chat/ws/1") as websocket:
-                # Should receive welcome message
-                data = websocket.receive_json()
-                assert data["type"] == "system"
-                assert "Connected to AI Tutor" in data["message"]
+        with client.websocket_connect("/api/v1/chat/ws/1") as websocket:
+            # Should receive welcome message
+            data = receive_events(websocket)[0]
+            assert data["type"] == "system"
+            assert "Connected to AI Tutor" in data["message"]
     
-    def test_websocket_message_processing(self):
+    def test_websocket_message_processing(self, client):
         """Test WebSocket message processing"""
         
-        with TestClient(app) as client:
-            with client.websocket_connect("/api/v1/chat/ws/1") as websocket:
-                # Skip welcome message
-                websocket.receive_json()
-                
-                # Send test message
-                websocket.send_json({
-                    "type": "user_message",
-                    "message": "How can I improve communication?"
-                })
-                
-                # Should receive AI response
-                response = websocket.receive_json()
-                assert response["type"] == "ai_response"
-                assert len(response["message"]) > 0
+        with client.websocket_connect("/api/v1/chat/ws/1") as websocket:
+            # Skip welcome message
+            receive_events(websocket)
+            
+            # Send test message
+            websocket.send_json({
+                "type": "user_message",
+                "message": "How can I improve communication?"
+            })
+            
+            # Should receive AI response
+            response = receive_events(websocket)[0]
+            assert response["type"] == "ai_response"
+            assert len(response["message"]) > 0
 
 if __name__ == "__main__":
     pytest.main([__file__, "-v"])
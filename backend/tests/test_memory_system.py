@@ -5,20 +5,35 @@ Comprehensive testing of 4-layer enhanced memory system
 
 import pytest
 import asyncio
-from fastapi.testclient import TestClient
-from sqlalchemy import create_engine
+from httpx import ASGITransport, AsyncClient
+from sqlalchemy import create_engine, event, insert
 from sqlalchemy.orm import sessionmaker
+from sqlalchemy.pool import StaticPool
 
 from app.main import app
-from app.core.database import get_db, Base
-from app.models import User, OnboardingSurvey, Module
+from app.core.database import get_db
+from app.models import Base, User, OnboardingSurvey, Module
 from app.services.memory_service import EnhancedMemoryService
 
-# Test database setup
-SQLALCHEMY_DATABASE_URL = "sqlite:///./test_memory.db"
-engine = create_engine(SQLALCHEMY_DATABASE_URL, connect_args={"check_same_thread": False})
+# Test database setup - in-memory, so no fsyncs; StaticPool keeps the one connection
+# (and with it the database) shared by every session and the TestClient thread
+SQLALCHEMY_DATABASE_URL = "sqlite://"
+engine = create_engine(
+    SQLALCHEMY_DATABASE_URL,
+    connect_args={"check_same_thread": False},
+    poolclass=StaticPool
+)
 TestingSessionLocal = sessionmaker(autocommit=False, autoflush=False, bind=engine)
 
+# pysqlite defers BEGIN on its own, which breaks SAVEPOINTs - let SQLAlchemy emit it instead
+@event.listens_for(engine, "connect")
+def _disable_pysqlite_begin(dbapi_connection, connection_record):
+    dbapi_connection.isolation_level = None
+
+@event.listens_for(engine, "begin")
+def _emit_begin(conn):
+    conn.exec_driver_sql("BEGIN")
+
 def override_get_db():
     try:
         db = TestingSessionLocal()
@@ -27,73 +42,86 @@ def override_get_db():
         db.close()
 
 app.dependency_overrides[get_db] = override_get_db
-client = TestClient(app)
 
-@pytest.fixture(scope="module")
+def api_client() -> AsyncClient:
+    """In-process async client - requests run on the test's event loop and can be gathered"""
+    return AsyncClient(transport=ASGITransport(app=app), base_url="http://test")
+
+@pytest.fixture(scope="session")
 def setup_database():
-    """Set up test database with sample data"""
+    """Set up test database with sample data - once per test run"""
     Base.metadata.create_all(bind=engine)
     db = TestingSessionLocal()
     
-    # Create test user
-    test_user = User(
-        email="test@memory.edu",
-        hashed_password="$2b$12$test_hash",
-        name="Memory Test User",
-        is_active=True
-    )
-    db.add(test_user)
-    db.commit()
-    db.refresh(test_user)
+    # Create test user - RETURNING hands back the id without a refresh() SELECT
+    user_id = db.execute(
+        insert(User).values(
+            email="test@memory.edu",
+            hashed_password="$2b$12$test_hash",
+            name="Memory Test User",
+            is_active=True
+        ).returning(User.id)
+    ).scalar_one()
     
     # Create onboarding survey
-    survey = OnboardingSurvey(
-        user_id=test_user.id,
+    db.execute(insert(OnboardingSurvey).values(
+        user_id=user_id,
         learning_style="visual",
         preferred_pace="moderate",
         goals="Master communication skills",
         interaction_preference="socratic",
         background_info="Student with some experience",
-        prior_experience="Basic communication courses",
-        communication_challenges="Public speaking anxiety",
-        preferred_examples="Business scenarios"
-    )
-    db.add(survey)
+        motivation_level="high",
+        time_availability="1-2 hours per week"
+    ))
     
     # Create test module
-    module = Module(
+    db.execute(insert(Module).values(
         id=1,
         title="Test Communication Module",
         description="Module for testing memory system",
-        content='{"learning_objectives": ["Test objective 1", "Test objective 2"], "key_concepts": ["Concept A", "Concept B"]}'
-    )
-    db.add(module)
+        system_prompt="Guide students through Socratic discovery of communication concepts.",
+        learning_objectives="Test objective 1; Test objective 2"
+    ))
     
     db.commit()
     db.close()
     
-    yield test_user.id
+    yield user_id
     
     # Cleanup
     Base.metadata.drop_all(bind=engine)
 
+@pytest.fixture
+def db_session(setup_database):
+    """
+    Session inside an outer transaction that is rolled back after each test
+    Commits in the code under test only release SAVEPOINTs, so the seeded data stays untouched
+    """
+    connection = engine.connect()
+    transaction = connection.begin()
+    db = TestingSessionLocal(bind=connection, join_transaction_mode="create_savepoint")
+    
+    yield db
+    
+    db.close()
+    transaction.rollback()
+    connection.close()
+
 class TestMemorySystem:
     """Test suite for enhanced memory system"""
     
     @pytest.mark.asyncio
-    async def test_memory_service_initialization(self, setup_database):
+    async def test_memory_service_initialization(self, db_session):
         """Test memory service can be initialized"""
-        db = TestingSessionLocal()
-        memory_service = EnhancedMemoryService(db)
+        memory_service = EnhancedMemoryService(db_session)
         assert memory_service is not None
-        db.close()
     
     @pytest.mark.asyncio
-    async def test_layer1_user_profile_assembly(self, setup_database):
+    async def test_layer1_user_profile_assembly(self, setup_database, db_session):
         """Test Layer 1: User Profile assembly"""
         user_id = setup_database
-        db = TestingSessionLocal()
-        memory_service = EnhancedMemoryService(db)
+        memory_service = EnhancedMemoryService(db_session)
         
         layer1 = await memory_service._assemble_layer1_user_profile(user_id)
         
@@ -101,14 +129,11 @@ class TestMemorySystem:
         assert 'Memory Test User' in layer1['content']
         assert 'visual' in layer1['content']
         assert layer1['metadata']['learning_style'] == 'visual'
-        
-        db.close()
     
     @pytest.mark.asyncio
-    async def test_layer2_module_context_assembly(self, setup_database):
+    async def test_layer2_module_context_assembly(self, db_session):
         """Test Layer 2: Module Context assembly"""
-        db = TestingSessionLocal()
-        memory_service = EnhancedMemoryService(db)
+        memory_service = EnhancedMemoryService(db_session)
         
         layer2 = await memory_service._assemble_layer2_module_context(1)
         
@@ -116,15 +141,46 @@ class TestMemorySystem:
         assert 'Test Communication Module' in layer2['content']
         assert 'Socratic Teaching Mode' in layer2['content']
         assert layer2['metadata']['socratic_mode'] is True
+    
+    @pytest.mark.asyncio
+    async def test_fused_layers_match_separate_assembly(self, setup_database, db_session):
+        """Test the joined layer 1+2 query renders the same content as the per-layer methods"""
+        user_id = setup_database
+        memory_service = EnhancedMemoryService(db_session)
         
-        db.close()
+        layer1, layer2 = await memory_service._assemble_layers_1_and_2(user_id, 1)
+        
+        assert layer1 == await memory_service._assemble_layer1_user_profile(user_id)
+        assert layer2 == await memory_service._assemble_layer2_module_context(1)
+        
+        with pytest.raises(ValueError):
+            await memory_service._assemble_layers_1_and_2(999999, 1)
     
     @pytest.mark.asyncio
-    async def test_full_memory_context_assembly(self, setup_database):
+    async def test_fused_layers_without_survey(self, db_session):
+        """Test a user with no onboarding survey still gets the default profile"""
+        user_id = db_session.execute(
+            insert(User).values(
+                email="nosurvey@memory.edu",
+                hashed_password="$2b$12$test_hash",
+                name="No Survey User",
+                is_active=True
+            ).returning(User.id)
+        ).scalar_one()
+        memory_service = EnhancedMemoryService(db_session)
+        
+        layer1, layer2 = await memory_service._assemble_layers_1_and_2(user_id, 1)
+        
+        assert 'error' not in layer1
+        assert 'No Survey User' in layer1['content']
+        assert layer1['metadata']['learning_style'] == 'visual'
+        assert layer2['metadata']['module_title'] == 'Test Communication Module'
+    
+    @pytest.mark.asyncio
+    async def test_full_memory_context_assembly(self, setup_database, db_session):
         """Test complete 4-layer memory context assembly"""
         user_id = setup_database
-        db = TestingSessionLocal()
-        memory_service = EnhancedMemoryService(db)
+        memory_service = EnhancedMemoryService(db_session)
         
         context = await memory_service.assemble_memory_context(
             user_id=user_id,
@@ -137,24 +193,28 @@ class TestMemorySystem:
         assert 'assembled_prompt' in context
         assert len(context['assembled_prompt']) > 0
         assert 'ENHANCED MEMORY CONTEXT' in context['assembled_prompt']
-        
-        db.close()
     
-    def test_memory_health_endpoint(self):
+    @pytest.mark.asyncio
+    async def test_memory_health_endpoint(self):
         """Test memory system health endpoint"""
-        response = client.get("/api/v1/memory/health")
+        async with api_client() as client:
+            response = await client.get("/api/v1/memory/health")
         assert response.status_code == 200
         data = response.json()
         assert data['status'] == 'healthy'
         assert data['layers_available'] == 4
 
-def test_memory_endpoints_without_auth():
+@pytest.mark.asyncio
+async def test_memory_endpoints_without_auth():
     """Test that memory endpoints require authentication"""
-    response = client.get("/api/v1/memory/context/1")
-    assert response.status_code == 401
+    async with api_client() as client:
+        context_response, chat_response = await asyncio.gather(
+            client.get("/api/v1/memory/context/1"),
+            client.post("/api/v1/memory/chat/1", json={"message": "test"})
+        )
     
-    response = client.post("/api/v1/memory/chat/1", json={"message": "test"})
-    assert response.status_code == 401
+    assert context_response.status_code == 401
+    assert chat_response.status_code == 401
 
 if __name__ == "__main__":
     pytest.main([__file__, "-v"])
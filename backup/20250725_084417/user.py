@@ -3,10 +3,14 @@ User-related models
 Ported from your existing schema with enhancements
 """
 
-from sqlalchemy import Column, Integer, String, Text, ForeignKey, Boolean
+from sqlalchemy import Column, Integer, String, Text, ForeignKey, Boolean, JSON
+from sqlalchemy.dialects.postgresql import JSONB
 from sqlalchemy.orm import relationship
 from .base import Base, TimestampMixin
 
+# Native JSON - decoded by the driver instead of json.loads at every use
+JSONColumn = JSON(none_as_null=True).with_variant(JSONB(none_as_null=True), "postgresql")
+
 class User(Base, TimestampMixin):
     """
     User model - core user information
@@ -14,11 +18,11 @@ class User(Base, TimestampMixin):
     """
     __tablename__ = "users"
     
-    id = Column(Integer, primary_key=True, index=True)
+    id = Column(Integer, primary_key=True)
     email = Column(String, unique=True, index=True, nullable=False)
     hashed_password = Column(String, nullable=False)
     name = Column(String, nullable=False)
-    onboarding_data = Column(Text)  # JSON string for onboarding responses
+    onboarding_data = Column(JSONColumn)  # Onboarding responses
     is_active = Column(Boolean, default=True)
     
     # Relationships
@@ -34,12 +38,12 @@ class OnboardingSurvey(Base, TimestampMixin):
     """
     __tablename__ = "onboarding_surveys"
     
-    id = Column(Integer, primary_key=True, index=True)
+    id = Column(Integer, primary_key=True)
     user_id = Column(Integer, ForeignKey("users.id", ondelete="CASCADE"), nullable=False, unique=True)
     
     # Survey responses (used by memory system)
     learning_style = Column(String)  # "visual", "auditory", "kinesthetic", "reading"
-    prior_experience = Column(Text)  # JSON string
+    prior_experience = Column(JSONColumn)
     goals = Column(Text)
     preferred_pace = Column(String)  # "slow", "medium", "fast"
     interaction_preference = Column(String)  # "questions", "examples", "practice"
@@ -61,7 +61,16 @@ class HarvAPI {
     const wsHost = window.location.host.replace(':3000', ':8000'); // Dev adjustment
     const wsUrl = `${wsProtocol}//${wsHost}/api/v1/chat/ws/${moduleId}${userId ? `?user_id=${userId}` : ''}`;
     
-    return new WebSocket(wsUrl);
+    const socket = new WebSocket(wsUrl);
+    socket.binaryType = 'arraybuffer'; // Chat events arrive as JSON in binary frames
+    return socket;
+  }
+
+  // Unpack one WebSocket message into chat events - batch frames carry several
+  parseWebSocketMessage(event) {
+    const text = typeof event.data === 'string' ? event.data : new TextDecoder().decode(event.data);
+    const payload = JSON.parse(text);
+    return payload.type === 'batch' ? payload.messages : [payload];
   }
 
   // Analytics Dashboard APIs
@@ -1,4 +1,5 @@
 import os
+from pathlib import Path
 
 def create_websocket_handler():
     """Create minimal WebSocket handler"""
@@ -8,67 +9,132 @@ Basic WebSocket support for real-time chat
 """
 
 from fastapi import WebSocket, WebSocketDisconnect
-import json
+from typing import Iterable
+import asyncio
 import logging
-from datetime import datetime
+import time
+import orjson
 
 logger = logging.getLogger(__name__)
 
+# Outbound events are coalesced into one {"type": "batch", "messages": [...]} frame per burst
+BATCH_INTERVAL = 0.02  # Seconds to keep collecting after the first queued event
+BATCH_MAX_MESSAGES = 140  # Events per frame - bounds frame size (a few tens of KB) on long token streams
+
+def epoch_ms() -> int:
+    """Integer epoch milliseconds - cheaper to produce and ship than an ISO string"""
+    return int(time.time() * 1000)
+
+# Streamed chunks carry seq/final for message boundaries; they stay JSON rather than msgpack
+# because the browser client has no msgpack decoder
+def queue_message(queue: asyncio.Queue, kind: str, module_id: int, seq: int, chunks: Iterable[str]) -> int:
+    """Queue each text chunk (e.g. AI tokens) as its own JSON event, returns the next seq"""
+    timestamp = epoch_ms()  # One clock read per message, shared by its chunks
+    pending = None
+    for chunk in chunks:
+        if pending is not None:
+            queue.put_nowait({"type": kind, "message": pending, "module_id": module_id, "seq": seq, "final": False, "timestamp": timestamp})
+            seq += 1
+        pending = chunk
+    queue.put_nowait({"type": kind, "message": pending or "", "module_id": module_id, "seq": seq, "final": True, "timestamp": timestamp})
+    return seq + 1
+
+async def drain_and_flush(websocket: WebSocket, queue: asyncio.Queue):
+    """Drain queued events into one batch frame per burst - one serialize and one socket write"""
+    loop = asyncio.get_running_loop()
+    try:
+        while True:
+            batch = [await queue.get()]
+            deadline = loop.time() + BATCH_INTERVAL
+            
+            while len(batch) < BATCH_MAX_MESSAGES:
+                if not queue.empty():
+                    batch.append(queue.get_nowait())
+                    continue
+                remaining = deadline - loop.time()
+                if remaining <= 0:
+                    break
+                try:
+                    batch.append(await asyncio.wait_for(queue.get(), remaining))
+                except asyncio.TimeoutError:
+                    break
+            
+            await websocket.send_bytes(orjson.dumps({"type": "batch", "messages": batch}))
+    except asyncio.CancelledError:
+        raise
+    except Exception as e:
+        logger.error(f"WebSocket flush error: {str(e)}")
+        raise
+
 async def websocket_endpoint(websocket: WebSocket, module_id: int, user_id: int = None):
     """Basic WebSocket endpoint for real-time chat"""
     await websocket.accept()
     
+    outbound = asyncio.Queue()
+    flusher = None
+    seq = 0
+    
     try:
         # Send welcome message
         welcome = {
             "type": "system",
             "message": f"Connected to AI Tutor for Module {module_id}",
-            "timestamp": datetime.now().isoformat()
+            "timestamp": epoch_ms()
         }
-        await websocket.send_text(json.dumps(welcome))
+        # Binary frames skip the UTF-8 encode/validate pass - clients decode the JSON from bytes
+        await websocket.send_bytes(orjson.dumps(welcome))
+        
+        # Everything after the welcome goes through the batching queue
+        flusher = asyncio.create_task(drain_and_flush(websocket, outbound))
         
         # Basic message loop
         while True:
-            data = await websocket.receive_text()
+            # Binary frames skip UTF-8 decoding; text frames from older clients are still accepted
+            message = await websocket.receive()
+            if message["type"] == "websocket.disconnect":
+                raise WebSocketDisconnect(message.get("code", 1000))
+            data = message.get("bytes") or message.get("text") or ""
+            
+            # A failed flush ends the connection instead of silently dropping replies
+            if flusher.done():
+                flusher.result()
             
             try:
-                message_data = json.loads(data)
+                message_data = orjson.loads(data)
                 user_message = message_data.get("message", "")
                 
-                # Echo response for now
-                response = {
-                    "type": "ai_response",
-                    "message": f"Thanks for your message: '{user_message}'. This is a basic WebSocket response. Full chat integration coming soon!",
-                    "timestamp": datetime.now().isoformat()
-                }
+                # Echo response for now - a streamed AI reply passes its token iterator here
+                reply = f"Thanks for your message: '{user_message}'. This is a basic WebSocket response. Full chat integration coming soon!"
+                seq = queue_message(outbound, "ai_response", module_id, seq, [reply])
                 
-                await websocket.send_text(json.dumps(response))
-                
-            except json.JSONDecodeError:
-                error_msg = {
-                    "type": "error",
-                    "message": "Invalid JSON format",
-                    "timestamp": datetime.now().isoformat()
-                }
-                await websocket.send_text(json.dumps(error_msg))
+            except orjson.JSONDecodeError:
+                seq = queue_message(outbound, "error", module_id, seq, ["Invalid JSON format"])
                 
     except WebSocketDisconnect:
         logger.info(f"WebSocket disconnected for module {module_id}")
     except Exception as e:
         logger.error(f"WebSocket error: {str(e)}")
         await websocket.close()
+    finally:
+        if flusher is not None:
+            flusher.cancel()
+            try:
+                await flusher
+            except asyncio.CancelledError:
+                pass
+            except Exception:
+                pass  # Already logged by drain_and_flush
 '''
     
-    # Create websocket directory if it doesn't exist
-    os.makedirs("backend/app/websocket", exist_ok=True)
-    
-    # Create __init__.py
-    with open("backend/app/websocket/__init__.py", "w") as f:
-        f.write("# WebSocket package\n")
+    files = {
+        "backend/app/websocket/__init__.py": "# WebSocket package\n",
+        "backend/app/websocket/chat_handler.py": websocket_code,
+    }
     
-    # Create chat_handler.py
-    with open("backend/app/websocket/chat_handler.py", "w") as f:
-        f.write(websocket_code)
+    # Create websocket directory if it doesn't exist, then write each file in one call
+    Path("backend/app/websocket").mkdir(parents=True, exist_ok=True)
+    for path, content in files.items():
+        Path(path).write_text(content)
     
     print("✅ Created WebSocket handler")
 
@@ -166,8 +232,7 @@ if __name__ == "__main__":
     )
 '''
     
-    with open("backend/app/main.py", "w") as f:
-        f.write(main_code)
+    Path("backend/app/main.py").write_text(main_code)
     
     print("✅ Fixed main.py")
 
@@ -1,5 +1,23 @@
 import os
 import re
+from pathlib import Path
+
+# Old snippet -> (replacement, label)
+FIELD_FIXES = {
+    'key_insights="; ".join(key_insights) if key_insights else "Communication learning in progress"':
+        ('what_learned="; ".join(key_insights) if key_insights else "Communication learning in progress"',
+         "key_insights → what_learned"),
+    'learning_connections="; ".join(learning_connections) if learning_connections else ""':
+        ('connections_made="; ".join(learning_connections) if learning_connections else ""',
+         "learning_connections → connections_made"),
+    'summary.key_insights = "; ".join(key_insights)':
+        ('summary.what_learned = "; ".join(key_insights)', "summary field update"),
+    'summary.learning_connections = "; ".join(learning_connections)':
+        ('summary.connections_made = "; ".join(learning_connections)', "summary field update"),
+}
+
+# One alternation so the file is scanned once instead of once per fix
+FIELD_FIX_PATTERN = re.compile("|".join(re.escape(old) for old in FIELD_FIXES))
 
 def fix_memory_service():
     """Fix memory service field names to match database schema"""
@@ -14,50 +32,25 @@ def fix_memory_service():
     print("🔧 TINY FIX: Updating memory field names...")
     
     # Read the current file
-    with open(service_path, 'r') as f:
-        content = f.read()
-    
-    # Apply fixes
-    fixes_applied = 0
+    path = Path(service_path)
+    content = path.read_text()
     
-    # Fix 1: Change key_insights to what_learned
-    if 'key_insights=' in content:
-        content = content.replace(
-            'key_insights="; ".join(key_insights) if key_insights else "Communication learning in progress"',
-            'what_learned="; ".join(key_insights) if key_insights else "Communication learning in progress"'
-        )
-        fixes_applied += 1
-        print("  ✅ Fixed: key_insights → what_learned")
+    # Apply all fixes in one pass over the file
+    matched = set()
     
-    # Fix 2: Change learning_connections to connections_made
-    if 'learning_connections=' in content:
-        content = content.replace(
-            'learning_connections="; ".join(learning_connections) if learning_connections else ""',
-            'connections_made="; ".join(learning_connections) if learning_connections else ""'
-        )
-        fixes_applied += 1
-        print("  ✅ Fixed: learning_connections → connections_made")
+    def apply_fix(match):
+        matched.add(match.group(0))
+        return FIELD_FIXES[match.group(0)][0]
     
-    # Fix 3: Update field references in updates
-    if 'summary.key_insights =' in content:
-        content = content.replace(
-            'summary.key_insights = "; ".join(key_insights)',
-            'summary.what_learned = "; ".join(key_insights)'
-        )
-        fixes_applied += 1
-        print("  ✅ Fixed: summary field update")
+    content = FIELD_FIX_PATTERN.sub(apply_fix, content)
     
-    if 'summary.learning_connections =' in content:
-        content = content.replace(
-            'summary.learning_connections = "; ".join(learning_connections)',
-            'summary.connections_made = "; ".join(learning_connections)'
-        )
-        fixes_applied += 1
-        print("  ✅ Fixed: summary field update")
+    for old, (_, label) in FIELD_FIXES.items():
+        if old in matched:
+            print(f"  ✅ Fixed: {label}")
+    fixes_applied = len(matched)
     
     # Write back the fixed content
-    with open(service_path, 'w') as f:
-        f.write(content)
+    path.write_text(content)
     
     print(f"✅ Applied {fixes_applied} fixes to memory service")
     return True